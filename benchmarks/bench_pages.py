@@ -0,0 +1,261 @@
+"""Benchmarks every insight page on synthetic multi-year ledgers (Streamlit calls stubbed out).
+
+    python benchmarks/bench_pages.py                      # default size matrix
+    python benchmarks/bench_pages.py --sizes 100000x10    # rows x years
+    python benchmarks/bench_pages.py --output bench.json --baseline baseline.json
+
+Each case is timed cold (all app caches cleared) and warm (second call on the same data);
+peak memory is the tracemalloc peak of a separate cold run. With --baseline, cases slower
+than the baseline by more than --tolerance are reported and the exit code is 1.
+"""
+import argparse
+from contextlib import ExitStack
+from datetime import datetime
+import json
+import os
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from utils import ai_insights, filter_data, monthly_insights, ui_utils, weekly_insights, yearly_overview
+from utils import filter_index, forecast_engine, insights_engine
+from utils.aggregates import aggregate_store, get_aggregates
+from utils.chart_cache import chart_cache
+from utils.data_utils import build_summary_df, filter_old_records
+from utils.gsheet_utils import build_canonical_frame, current_sheet_title
+from utils.forecast_engine import get_forecast
+from utils.insights_engine import get_insights
+
+DEFAULT_SIZES = [(1_000, 1), (10_000, 3), (100_000, 10), (1_000_000, 20)]
+PAGE_MODULES = [ai_insights, filter_data, monthly_insights, ui_utils, weekly_insights, yearly_overview]
+
+DEBIT_CATEGORIES = {
+    "Today's expense ": ['Snacks', 'Tea/Coffee', 'Stationery'],
+    'Weekend expense': ['Movie', 'Lunch Out', 'Day Outing'],
+    'Financial Support to Family': ['Money to Parents', 'Family Support'],
+    'Shopping': ['Clothes', 'Electronics', 'Online Shopping'],
+    'Petrol': ['Fuel Station', 'Fuel Card'],
+    'Self Care': ['Salon', 'Spa', 'Gym Membership'],
+    'Recharge': ['Mobile Recharge', 'DTH Recharge'],
+    'SIP': ['SIP - Mutual Fund', 'SIP - ELSS'],
+    'Veggies,Gas cylinder and Dmart': ['Vegetables', 'Gas Cylinder', 'Dmart Purchase'],
+    'Rent,Maid & Electricity bills': ['Rent', 'Maid Payment', 'Electricity Bill'],
+    'Pune & village expense': ['Pune Trip', 'Village Visit'],
+    'Travelling expense': ['Taxi', 'Train Ticket', 'Hotel'],
+    'Trips': ['Weekend Trip', 'Vacation Booking'],
+    'Other': ['Miscellaneous'],
+}
+CREDIT_DETAILS = ['Salary', 'Bonus', 'Freelance', 'Refund', 'Investment Return']
+
+# 🧪 Synthetic ledgers in the exact load_yearly_data shape ({"test-YYYY": canonical frame})
+def make_ledger(rows, years, seed=0):
+    rng = np.random.default_rng(seed)
+    last_year = datetime.now().year
+    ledger = {}
+    for year, count in zip(range(last_year - years + 1, last_year + 1), np.array_split(np.arange(rows), years)):
+        n = len(count)
+        start = pd.Timestamp(year=year, month=1, day=1)
+        days = (pd.Timestamp(year=year, month=12, day=31) - start).days + 1
+        dates = (start + pd.to_timedelta(np.sort(rng.integers(0, days, n)), unit='D'))
+        is_credit = rng.random(n) < 0.05
+
+        categories = np.array(list(DEBIT_CATEGORIES), dtype=object)[rng.integers(0, len(DEBIT_CATEGORIES), n)]
+        debit_details = np.array([DEBIT_CATEGORIES[c][i % len(DEBIT_CATEGORIES[c])] for i, c in enumerate(categories)], dtype=object)
+        credit_details = np.array(CREDIT_DETAILS, dtype=object)[rng.integers(0, len(CREDIT_DETAILS), n)]
+
+        raw = pd.DataFrame({
+            'date': dates.strftime('%d-%m-%Y'),
+            'month': dates.strftime('%B'),
+            'credit': np.where(is_credit, rng.integers(5_000, 100_000, n), 0),
+            'credit_details': np.where(is_credit, credit_details, 'NA'),
+            'debit': np.where(is_credit, 0, -rng.integers(10, 5_000, n)),
+            'debit_details': np.where(is_credit, 'NA', debit_details),
+            'category': np.where(is_credit, 'credit', categories),
+        })
+        title = f"test-{year}"
+        ledger[title] = build_canonical_frame(title, raw)
+    return ledger
+
+# 🪄 Streamlit stand-in: display calls are no-ops, widgets return their default value
+class StreamlitStub:
+    def __init__(self):
+        self.session_state = {}
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        options = list(options)
+        return options[index] if options else None
+
+    def radio(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    def multiselect(self, label, options, default=None, **kwargs):
+        return list(default or [])
+
+    def slider(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        return value
+
+    def date_input(self, label, value=None, **kwargs):
+        return value
+
+    def number_input(self, label, min_value=None, max_value=None, value="min", **kwargs):
+        if value == "min":
+            return min_value if min_value is not None else 0
+        return value
+
+    def text_input(self, label, value="", **kwargs):
+        return value
+
+    def checkbox(self, label, value=False, **kwargs):
+        return value
+
+    def button(self, *args, **kwargs):
+        return False
+
+    def columns(self, spec, **kwargs):
+        return [StreamlitStub() for _ in range(spec if isinstance(spec, int) else len(spec))]
+
+    def expander(self, *args, **kwargs):
+        return self
+
+    def form(self, *args, **kwargs):
+        return self
+
+    def empty(self):
+        return self
+
+def reset_caches():
+    """Cold start: drop every in-process cache the pages rely on."""
+    chart_cache.clear()
+    aggregate_store.clear()
+    insights_engine._results.clear()
+    forecast_engine._forecasts.clear()
+    filter_index._index.update(key=None, value=None)
+
+# 📋 Cases: (name, callable taking the ledger)
+def _current_year(ledger):
+    return ledger.get(current_sheet_title(), next(reversed(ledger.values())))
+
+def _summary_df(ledger):
+    build_summary_df(filter_old_records(_current_year(ledger)))
+
+def _monthly(ledger):
+    df = filter_old_records(_current_year(ledger))
+    monthly_insights.generate_monthly_insights(df, get_aggregates({current_sheet_title(): _current_year(ledger)}))
+
+def _monthly_summary(ledger):
+    monthly_insights.get_monthly_summary(monthly_insights.prepare_data(filter_old_records(_current_year(ledger))))
+
+def _weekly(ledger):
+    df = filter_old_records(_current_year(ledger))
+    weekly_insights.generate_weekly_insights(df, get_aggregates({current_sheet_title(): _current_year(ledger)}))
+
+def _ai_scoring(ledger):
+    get_insights(get_aggregates(ledger), ledger.keys())
+
+CASES = [
+    ('filter_old_records', lambda ledger: filter_old_records(_current_year(ledger))),
+    ('build_summary_df', _summary_df),
+    ('get_monthly_summary', _monthly_summary),
+    ('summary_page', ui_utils.show_summary),
+    ('weekly_insights', _weekly),
+    ('monthly_insights', _monthly),
+    ('yearly_overview', yearly_overview.show_yearly_overview),
+    ('filter_page', filter_data.display_filtered_data),
+    ('ai_insights_scoring', _ai_scoring),
+    ('forecast', lambda ledger: get_forecast(get_aggregates(ledger), ledger.keys())),
+    ('ai_insights_page', ai_insights.show_ai_insights),
+]
+
+def _timed(fn, ledger):
+    start = time.perf_counter()
+    fn(ledger)
+    return time.perf_counter() - start
+
+def run_case(fn, ledger):
+    reset_caches()
+    cold = _timed(fn, ledger)
+    warm = _timed(fn, ledger)
+
+    reset_caches()
+    tracemalloc.start()
+    try:
+        fn(ledger)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'cold_s': round(cold, 4), 'warm_s': round(warm, 4), 'peak_mb': round(peak / 2**20, 2)}
+
+def run(sizes, case_names=None):
+    results = []
+    stub = StreamlitStub()
+    with ExitStack() as stack:
+        for module in PAGE_MODULES:
+            stack.enter_context(mock.patch.object(module, 'st', stub))
+        for rows, years in sizes:
+            ledger = make_ledger(rows, years)
+            for name, fn in CASES:
+                if case_names and name not in case_names:
+                    continue
+                result = {'case': name, 'rows': rows, 'years': years, **run_case(fn, ledger)}
+                results.append(result)
+                print(f"{name:<22} {rows:>9} rows {years:>2}y  cold {result['cold_s']:>8.3f}s  "
+                      f"warm {result['warm_s']:>8.3f}s  peak {result['peak_mb']:>8.1f} MB", flush=True)
+    return results
+
+def compare(results, baseline, tolerance):
+    """Cases whose cold time grew more than `tolerance` (fraction) over the baseline."""
+    previous = {(r['case'], r['rows'], r['years']): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result['case'], result['rows'], result['years']))
+        if before and result['cold_s'] > before['cold_s'] * (1 + tolerance) and result['cold_s'] - before['cold_s'] > 0.01:
+            regressions.append((result, before))
+    return regressions
+
+def _parse_size(value):
+    rows, _, years = value.lower().partition('x')
+    return int(rows), int(years or 1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', type=_parse_size, default=DEFAULT_SIZES, help="rows x years, e.g. 10000x3")
+    parser.add_argument('--cases', nargs='+', choices=[name for name, _ in CASES])
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--baseline', help="JSON from an earlier --output to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.cases)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'created_at': datetime.now().isoformat(timespec='seconds'), 'results': results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+        for result, before in regressions:
+            print(f"REGRESSION {result['case']} {result['rows']}x{result['years']}: "
+                  f"{before['cold_s']:.3f}s -> {result['cold_s']:.3f}s")
+        if regressions:
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import gsheet_utils, snapshot_store, year_archive
+from utils.aggregates import aggregate_store
+from utils.dataset_cache import dataset_cache
+from utils.local_sheets import LocalSpreadsheet
+from utils.sheets_scheduler import TokenBucket, sheets_scheduler
+
+HEADER = ["date", "month", "credit", "credit_details", "debit", "debit_details", "category"]
+
+def debit_row(date, amount, details='shop', category='Food'):
+    return [date, 'x', 0, 'NA', -amount, details, category]
+
+def credit_row(date, amount, details='salary', category='Salary'):
+    return [date, 'x', amount, details, 0, 'NA', category]
+
+@pytest.fixture
+def local_sheets(tmp_path, monkeypatch):
+    """Returns make(sheets) → a LocalSpreadsheet holding {title: rows}, with snapshots, archives
+    and every shared cache isolated to this test (and no request quota)."""
+    monkeypatch.setattr(snapshot_store, 'SNAPSHOT_DIR', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(year_archive, 'ARCHIVE_DIR', str(tmp_path / 'archives'))
+    monkeypatch.setattr(sheets_scheduler, 'buckets', {quota: TokenBucket(60000) for quota in ('read', 'write')})
+    dataset_cache.clear()
+    aggregate_store.clear()
+    gsheet_utils._archive_frames.clear()
+    gsheet_utils.sync_errors.clear()
+
+    def make(sheets):
+        path = tmp_path / 'local_sheets.json'
+        path.write_text(json.dumps({title: [HEADER] + rows for title, rows in sheets.items()}))
+        return LocalSpreadsheet(path=str(path))
+
+    yield make
+    dataset_cache.clear()
+    aggregate_store.clear()
+    gsheet_utils._archive_frames.clear()
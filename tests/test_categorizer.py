@@ -0,0 +1,52 @@
+import pandas as pd
+
+from conftest import HEADER, credit_row, debit_row
+from utils.categorizer import Categorizer, DEFAULT_CATEGORY
+from utils.gsheet_utils import build_canonical_frame
+
+HISTORY = [
+    # 'swiggy' is always a weekend expense here, although the rules say "Today's expense "
+    debit_row('01-03-2024', 300, details='swiggy party', category='Weekend expense'),
+    debit_row('08-03-2024', 250, details='swiggy', category='Weekend expense'),
+    # 'zomato' is split evenly: not confident enough to beat the rules
+    debit_row('02-03-2024', 100, details='zomato', category='Weekend expense'),
+    debit_row('03-03-2024', 120, details='zomato', category='Trips'),
+    # 'kirana' has no rule and a 50% favourite
+    debit_row('04-03-2024', 80, details='kirana', category='Shopping'),
+    debit_row('05-03-2024', 90, details='kirana', category='Shopping'),
+    debit_row('06-03-2024', 70, details='kirana', category='Weekend expense'),
+    debit_row('07-03-2024', 60, details='kirana', category='Trips'),
+    # seen once: too rare to vote
+    debit_row('09-03-2024', 500, details='gadgetwala', category='Shopping'),
+    credit_row('01-03-2024', 900, details='kirana refund', category='Side Income'),
+]
+
+def categorizer():
+    return Categorizer({'test-2024': build_canonical_frame('test-2024', pd.DataFrame(HISTORY, columns=HEADER))})
+
+def test_precedence_confident_history_rules_any_history_default():
+    result = categorizer().categorize(['Swiggy order', 'zomato', 'kirana store', 'gadgetwala', 'dmart', ''], False)
+    assert result.tolist() == [
+        'Weekend expense',  # confident history beats the rule
+        "Today's expense ",  # the rule beats unconfident history
+        'Shopping',  # no rule: any history
+        DEFAULT_CATEGORY,  # no rule, token too rare to vote
+        'Veggies,Gas cylinder and Dmart',  # rule, no history
+        DEFAULT_CATEGORY,
+    ]
+
+def test_credit_and_debit_history_are_learned_separately():
+    result = categorizer().categorize(['kirana', 'kirana'], [True, False])
+    assert result.tolist() == [DEFAULT_CATEGORY, 'Shopping']  # one credit 'kirana' is too rare to vote
+
+def test_suggest_only_returns_one_of_the_options():
+    model = categorizer()
+    assert model.suggest('swiggy', options=['Weekend expense', "Today's expense "]) == 'Weekend expense'
+    assert model.suggest('swiggy', options=["Today's expense ", 'Other']) == "Today's expense "  # falls back to the rule
+    assert model.suggest('kirana', options=['Other']) is None
+
+def test_youtube_rule_matches_payouts_only():
+    details = ['YouTube payout Oct', 'Google Pay transfer', 'ADSENSE', 'GOOGLE ASIA PACIFIC PTE', 'youtube premium refund']
+    assert Categorizer().categorize(details, True).tolist() == [
+        'Youtube Earning', DEFAULT_CATEGORY, 'Youtube Earning', 'Youtube Earning', DEFAULT_CATEGORY,
+    ]
@@ -0,0 +1,82 @@
+import os
+import time
+
+from conftest import debit_row
+from utils import gsheet_utils
+from utils.dataset_cache import dataset_cache
+from utils.snapshot_store import FULL_SYNC_INTERVAL, full_sync_age, mark_full_sync, snapshot_path
+
+def record_ranges(spreadsheet):
+    ranges = []
+    batch_get = spreadsheet.values_batch_get
+    def recording(value_ranges, **kwargs):
+        ranges.append(list(value_ranges))
+        return batch_get(value_ranges, **kwargs)
+    spreadsheet.values_batch_get = recording
+    return ranges
+
+def cold_start(spreadsheet, title):
+    """A new process: nothing in memory, the frame is served from its snapshot."""
+    dataset_cache.clear()
+    df = gsheet_utils._load_from_snapshot(title)
+    dataset_cache.put(spreadsheet.id, title, df, -1)
+    return df
+
+def test_full_load_writes_snapshot_and_records_full_sync(local_sheets):
+    title = gsheet_utils.current_sheet_title()
+    spreadsheet = local_sheets({title: [debit_row('01-01-2026', 10), debit_row('02-01-2026', 20)]})
+
+    data = gsheet_utils.load_yearly_data(spreadsheet)
+
+    assert len(data[title]) == 2
+    assert os.path.exists(snapshot_path(title))
+    assert full_sync_age(title) < 60
+
+def test_delta_sync_reads_only_rows_past_the_snapshot(local_sheets):
+    title = gsheet_utils.current_sheet_title()
+    spreadsheet = local_sheets({title: [debit_row('01-01-2026', 10), debit_row('02-01-2026', 20)]})
+    gsheet_utils.load_yearly_data(spreadsheet)
+    spreadsheet._data[title].append(debit_row('03-01-2026', 30, details='added elsewhere'))
+
+    base = cold_start(spreadsheet, title)
+    ranges = record_ranges(spreadsheet)
+    gsheet_utils._sync_worksheets(spreadsheet, [title])
+
+    assert ranges == [[f"'{title}'!A4:G"]]
+    synced = dataset_cache.peek(spreadsheet.id, title)
+    assert len(base) == 2 and len(synced) == 3
+    assert synced['debit_details'].tolist() == ['shop', 'shop', 'added elsewhere']
+    assert gsheet_utils.sync_errors == {}
+
+def test_delta_sync_without_new_rows_keeps_the_snapshot(local_sheets):
+    title = gsheet_utils.current_sheet_title()
+    spreadsheet = local_sheets({title: [debit_row('01-01-2026', 10)]})
+    gsheet_utils.load_yearly_data(spreadsheet)
+    written_at = os.path.getmtime(snapshot_path(title))
+    synced_at = full_sync_age(title)
+
+    cold_start(spreadsheet, title)
+    time.sleep(0.01)
+    gsheet_utils._sync_worksheets(spreadsheet, [title])
+
+    assert os.path.getmtime(snapshot_path(title)) == written_at
+    assert full_sync_age(title) >= synced_at
+    assert len(dataset_cache.peek(spreadsheet.id, title)) == 1
+
+def test_old_full_sync_triggers_a_full_download(local_sheets):
+    title = gsheet_utils.current_sheet_title()
+    spreadsheet = local_sheets({title: [debit_row('01-01-2026', 10), debit_row('02-01-2026', 20)]})
+    gsheet_utils.load_yearly_data(spreadsheet)
+    spreadsheet._data[title][1] = debit_row('01-01-2026', 15)  # edited in the sheet: invisible to a delta read
+    del spreadsheet._data[title][2]
+    spreadsheet._data[title].append(debit_row('05-01-2026', 50))
+
+    mark_full_sync(title, time.time() - FULL_SYNC_INTERVAL - 1)
+    cold_start(spreadsheet, title)
+    ranges = record_ranges(spreadsheet)
+    gsheet_utils._sync_worksheets(spreadsheet, [title])
+
+    assert ranges == [[f"'{title}'"]]
+    synced = dataset_cache.peek(spreadsheet.id, title)
+    assert synced['debit'].tolist() == [-15, -50]
+    assert full_sync_age(title) < 60
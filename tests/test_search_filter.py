@@ -0,0 +1,92 @@
+import pandas as pd
+
+from conftest import HEADER, credit_row, debit_row
+from utils.filter_index import FilterIndex
+from utils.gsheet_utils import build_canonical_frame
+from utils.search_index import SearchIndex
+
+LEDGER = {
+    'test-2024': [
+        credit_row('01-03-2024', 5000, details='salary march'),
+        debit_row('05-03-2024', 120, details='dmart groceries'),
+        debit_row('10-03-2024', 40, details='uber ride', category='Travel'),
+        debit_row('12-04-2024', 300, details='dmart dmart bulk'),
+        debit_row('20-04-2024', 80, details='ubereats order'),
+    ],
+    'test-2025': [
+        debit_row('02-01-2025', 90, details='swiggy dinner'),
+        debit_row('15-02-2025', 60, details='uber airport', category='Travel'),
+        debit_row('20-02-2025', 200, details='dmart'),
+        debit_row('21-02-2025', 70, details='ubereats lunch'),
+    ],
+}
+
+def ledger():
+    return {title: build_canonical_frame(title, pd.DataFrame(rows, columns=HEADER)) for title, rows in LEDGER.items()}
+
+def search_index(yearly_data):
+    index = SearchIndex()
+    for title, df in yearly_data.items():
+        index.add_frame(title, df, frame=df)
+    return index
+
+def pandas_search(yearly_data, query):
+    """Every row whose details or category has a word starting with each query term."""
+    matches = set()
+    for title, df in yearly_data.items():
+        details = df['credit_details'].where(df['credit'] > 0, df['debit_details']).astype(str)
+        text = (details + ' ' + df['category'].astype(str)).str.lower()
+        mask = pd.Series(True, index=df.index)
+        for term in query.lower().split():
+            mask &= text.str.contains(rf'\b{term}', regex=True)
+        matches |= {(title, d) for d in details[mask]}
+    return matches
+
+def test_search_matches_a_pandas_word_prefix_filter():
+    yearly_data = ledger()
+    index = search_index(yearly_data)
+    for query in ['dmart', 'dma', 'uber', 'ub', 'uber air', 'food', 'SALARY', 'travel uber', 'zomato']:
+        result = index.search(query)
+        assert set(zip(result['sheet'], result['details'])) == pandas_search(yearly_data, query), query
+
+def test_search_ranks_by_term_frequency_then_exact_over_prefix():
+    index = search_index(ledger())
+
+    dmart = index.search('dmart')
+    assert dmart['details'].iloc[0] == 'dmart dmart bulk'  # tf 2
+    assert dmart['score'].is_monotonic_decreasing
+
+    uber = index.search('uber')
+    assert uber['details'].tolist()[:2] == ['uber airport', 'uber ride']  # exact hits, newest first on ties
+    assert set(uber['details'].tolist()[2:]) == {'ubereats order', 'ubereats lunch'}
+    assert index.search('uber', limit=1)['details'].tolist() == ['uber airport']
+
+def pandas_filter(yearly_data, categories, amount_range, date_range, text):
+    results = {}
+    for title, df in yearly_data.items():
+        debits = df[df['debit'] < 0]
+        mask = (
+            debits['category'].astype(str).isin(categories)
+            & debits['debit'].abs().between(*amount_range)
+            & debits['date'].between(*(pd.Timestamp(value) for value in date_range))
+            & debits['debit_details'].str.lower().str.contains(text.lower(), regex=False)
+        )
+        if mask.any():
+            results[title.split('-')[-1]] = debits[mask].sort_values('date')['debit_details'].tolist()
+    return results
+
+def test_filter_query_matches_a_pandas_filter():
+    yearly_data = ledger()
+    index = FilterIndex(yearly_data)
+    cases = [
+        (['Food'], (0, 10**6), ('2000-01-01', '2100-01-01'), ''),
+        (['Food', 'Travel'], (50, 250), ('2024-03-01', '2025-02-20'), ''),
+        (['Food', 'Travel'], (0, 10**6), ('2000-01-01', '2100-01-01'), 'UBER'),
+        (['Travel'], (0, 50), ('2025-01-01', '2025-12-31'), ''),
+        (['Salary'], (0, 10**6), ('2000-01-01', '2100-01-01'), ''),
+    ]
+    for categories, amount_range, date_range, text in cases:
+        result = index.query(categories, amount_range, date_range, text)
+        assert list(result) == sorted(result, reverse=True)  # newest year first
+        got = {year: rows['debit_details'].tolist() for year, rows in result.items()}
+        assert got == pandas_filter(yearly_data, categories, amount_range, date_range, text), categories
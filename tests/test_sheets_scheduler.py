@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from utils.local_sheets import _quota_error
+from utils.sheets_scheduler import SheetsScheduler, TokenBucket
+
+def make_scheduler(**kwargs):
+    sleeps = []
+    scheduler = SheetsScheduler(reads_per_minute=6000, writes_per_minute=6000, sleep=sleeps.append,
+                                jitter=lambda: 1.0, **kwargs)
+    return scheduler, sleeps
+
+def flaky(errors, result='ok'):
+    """A call failing with each of `errors` in turn, then returning `result`."""
+    calls = []
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return fn, calls
+
+def test_read_retries_429_and_5xx_with_backoff():
+    scheduler, sleeps = make_scheduler()
+    fn, calls = flaky([_quota_error(429), _quota_error(503), requests.exceptions.ConnectionError()])
+    assert scheduler.read('key', fn) == 'ok'
+    assert len(calls) == 4
+    assert sleeps == [1.0, 2.0, 4.0]
+    assert scheduler.stats()['retries'] == 3
+
+def test_read_gives_up_after_max_retries():
+    scheduler, _ = make_scheduler(max_retries=2)
+    fn, calls = flaky([_quota_error(429)] * 5)
+    with pytest.raises(Exception):
+        scheduler.read('key', fn)
+    assert len(calls) == 3
+
+def test_client_errors_are_not_retried():
+    scheduler, _ = make_scheduler()
+    fn, calls = flaky([_quota_error(400)])
+    with pytest.raises(Exception):
+        scheduler.read('key', fn)
+    assert len(calls) == 1
+
+def test_writes_retry_on_429_only():
+    scheduler, _ = make_scheduler()
+    fn, calls = flaky([_quota_error(429)])
+    assert scheduler.write(fn) == 'ok'
+    assert len(calls) == 2
+
+    for error in (_quota_error(500), requests.exceptions.Timeout(), requests.exceptions.ConnectionError()):
+        fn, calls = flaky([error])
+        with pytest.raises(type(error)):
+            scheduler.write(fn)
+        assert len(calls) == 1  # the append may have landed: never sent twice
+
+def test_identical_reads_in_flight_are_coalesced():
+    scheduler, _ = make_scheduler()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_read():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'values'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(scheduler.read('batch', slow_read)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(scheduler.read('batch', slow_read))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while scheduler.stats()['coalesced'] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert results == ['values'] * 4
+    assert len(calls) == 1
+    assert scheduler.read('batch', lambda: 'fresh') == 'fresh'  # nothing cached once the read is done
+
+def test_writes_run_in_submission_order():
+    scheduler, _ = make_scheduler()
+    release = threading.Event()
+    order = []
+
+    def first():
+        release.wait(5)
+        order.append(0)
+
+    threads = [threading.Thread(target=scheduler.write, args=(first,))]
+    threads[0].start()
+    for i in range(1, 6):
+        while scheduler._next_ticket < i:  # each write takes its ticket before the next is submitted
+            time.sleep(0.001)
+        threads.append(threading.Thread(target=scheduler.write, args=(order.append, i)))
+        threads[-1].start()
+    while scheduler._next_ticket < 6:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == [0, 1, 2, 3, 4, 5]
+
+def test_token_bucket_throttles_past_its_burst():
+    now = [0.0]
+    waits = []
+    bucket = TokenBucket(60, capacity=2, clock=lambda: now[0], sleep=waits.append)
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+    now[0] = 10.0
+    assert bucket.acquire() == 0.0
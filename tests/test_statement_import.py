@@ -0,0 +1,79 @@
+import io
+
+import pandas as pd
+
+from conftest import HEADER, credit_row, debit_row
+from utils import gsheet_utils
+from utils.gsheet_utils import build_canonical_frame
+from utils.statement_import import RowDeduper, import_statement, map_columns, normalize_chunk
+
+def normalize(columns, rows):
+    chunk = pd.DataFrame(rows, columns=columns, dtype=str)
+    return normalize_chunk(chunk, map_columns(chunk.columns))
+
+def statement(*rows):
+    """Rows of (date, details, withdrawal, deposit) as a bank-style chunk, already normalized."""
+    rows, _ = normalize(['Txn Date', 'Narration', 'Withdrawal Amt.', 'Deposit Amt.'], list(rows))
+    return rows
+
+def test_normalize_credit_and_debit_columns():
+    rows, dropped = normalize(
+        ['Txn Date', 'Narration', 'Withdrawal Amt.', 'Deposit Amt.'],
+        [['05-03-2024', 'DMART', '1,250.50', ''], ['06-03-2024', 'SALARY', '', '50,000'],
+         ['', 'no date', '10', ''], ['07-03-2024', 'nothing moved', '', '']],
+    )
+    assert dropped == 2
+    assert rows['date'].dt.strftime('%d-%m-%Y').tolist() == ['05-03-2024', '06-03-2024']
+    assert rows['debit'].tolist() == [-1250.5, 0]
+    assert rows['credit'].tolist() == [0, 50000]
+    assert rows['debit_details'].tolist() == ['DMART', '']
+    assert rows['credit_details'].tolist() == ['', 'SALARY']
+    assert rows['category'].tolist() == ['', '']
+
+def test_normalize_signed_amount_and_cr_dr_side():
+    signed, _ = normalize(['Date', 'Description', 'Amount'], [['05-03-2024', 'refund', '200'], ['05-03-2024', 'rent', '-900']])
+    assert signed['credit'].tolist() == [200, 0]
+    assert signed['debit'].tolist() == [0, -900]
+
+    sided, _ = normalize(['Date', 'Description', 'Amount', 'Type'],
+                         [['05-03-2024', 'refund', '200', 'CR'], ['05-03-2024', 'rent', '900', 'DR']])
+    assert sided['credit'].tolist() == [200, 0]
+    assert sided['debit'].tolist() == [0, -900]
+
+def test_duplicates_inside_one_chunk_are_kept():
+    # Two identical payments on one day are two transactions, not a re-import
+    deduper = RowDeduper([])
+    rows = statement(['05-03-2024', 'tea', '20', ''], ['05-03-2024', 'tea', '20', ''], ['06-03-2024', 'bus', '15', ''])
+    assert deduper.new_rows(rows).tolist() == [True, True, True]
+
+def test_chunk_boundaries_do_not_change_the_outcome():
+    existing = build_canonical_frame('test-2024', pd.DataFrame([debit_row('05-03-2024', 20, details='tea')], columns=HEADER))
+    tea = ['05-03-2024', 'tea', '20', '']
+
+    one_chunk = RowDeduper([existing]).new_rows(statement(tea, tea, tea))
+    deduper = RowDeduper([existing])
+    split = [*deduper.new_rows(statement(tea)), *deduper.new_rows(statement(tea, tea))]
+
+    assert one_chunk.tolist() == split == [False, True, True]
+
+def test_rows_already_in_the_sheet_are_dropped():
+    existing = build_canonical_frame('test-2024', pd.DataFrame([
+        debit_row('05-03-2024', 1250.5, details='DMART'),
+        credit_row('06-03-2024', 50000, details='SALARY'),
+    ], columns=HEADER))
+    rows = statement(['05-03-2024', ' DMART ', '1,250.50', ''], ['06-03-2024', 'SALARY', '', '50000'],
+                     ['06-03-2024', 'SALARY', '', '50001'])
+    assert RowDeduper([existing]).new_rows(rows).tolist() == [False, False, True]
+
+def test_reimporting_a_statement_imports_nothing(local_sheets):
+    spreadsheet = local_sheets({'test-2024': [debit_row('05-03-2024', 20, details='tea')]})
+    csv = "Txn Date,Narration,Withdrawal Amt.,Deposit Amt.\n05-03-2024,tea,20,\n05-03-2024,tea,20,\n06-03-2024,bus,15,\n"
+
+    first = import_statement(spreadsheet, io.StringIO(csv), 'statement.csv',
+                             gsheet_utils.load_yearly_data(spreadsheet), chunk_rows=2)
+    assert (first.rows_read, first.imported, first.duplicates) == (3, 2, 1)
+
+    again = import_statement(spreadsheet, io.StringIO(csv), 'statement.csv',
+                             gsheet_utils.load_yearly_data(spreadsheet), chunk_rows=2)
+    assert (again.imported, again.duplicates) == (0, 3)
+    assert [row[5] for row in spreadsheet._data['test-2024'][1:]] == ['tea', 'tea', 'bus']
@@ -0,0 +1,85 @@
+from datetime import datetime
+import os
+import time
+
+from conftest import debit_row
+from utils import gsheet_utils
+from utils.aggregates import aggregate_store
+from utils.year_archive import archive_path, is_closed, list_archives, load_archive
+
+CLOSED = 'test-2020'
+
+def load(spreadsheet):
+    gsheet_utils._archive_frames.clear()  # a new process: only the disk survives
+    return gsheet_utils.load_yearly_data(spreadsheet)
+
+def test_is_closed_after_the_grace_period():
+    assert not is_closed('test-2024', today=datetime(2025, 1, 10))
+    assert is_closed('test-2024', today=datetime(2025, 1, 16))
+    assert not is_closed('Sheet1')
+
+def test_closed_year_is_archived_then_served_without_requests(local_sheets):
+    spreadsheet = local_sheets({CLOSED: [debit_row('01-03-2020', 10), debit_row('02-03-2020', 20)]})
+
+    first = load(spreadsheet)
+    assert list_archives() == [CLOSED]
+    archive = load_archive(CLOSED)
+    assert archive['manifest']['rows'] == 2
+
+    requests = spreadsheet.requests
+    second = load(spreadsheet)
+    assert spreadsheet.requests == requests  # worksheet listing still cached, year read from its archive
+    assert second[CLOSED]['debit'].tolist() == first[CLOSED]['debit'].tolist() == [-10, -20]
+    assert aggregate_store.frame([CLOSED])['debit'].sum() == -30
+
+def test_writing_to_a_closed_year_reopens_it(local_sheets):
+    spreadsheet = local_sheets({CLOSED: [debit_row('01-03-2020', 10)]})
+    load(spreadsheet)
+    assert list_archives() == [CLOSED]
+
+    sheet = gsheet_utils.get_worksheet(spreadsheet, CLOSED)
+    row = dict(zip(gsheet_utils.SHEET_COLUMNS, debit_row('05-03-2020', 40, details='late import')))
+    gsheet_utils.append_rows_to_gsheet(sheet, [row])
+    assert list_archives() == []
+
+    reloaded = load(spreadsheet)
+    assert reloaded[CLOSED]['debit'].tolist() == [-10, -40]
+    gsheet_utils.dataset_cache.clear()
+    gsheet_utils._sync_worksheets(spreadsheet, [CLOSED])  # the next fresh read freezes the year again
+    assert list_archives() == [CLOSED]
+    assert load_archive(CLOSED)['manifest']['rows'] == 2
+
+def test_a_read_overtaken_by_a_write_is_not_archived(local_sheets):
+    spreadsheet = local_sheets({CLOSED: [debit_row('01-03-2020', 10)]})
+    sheet = gsheet_utils.get_worksheet(spreadsheet, CLOSED)
+    row = dict(zip(gsheet_utils.SHEET_COLUMNS, debit_row('05-03-2020', 40)))
+    batch_get = spreadsheet.values_batch_get
+
+    def read_then_write(ranges, **kwargs):
+        values = batch_get(ranges, **kwargs)
+        gsheet_utils.append_rows_to_gsheet(sheet, [row])  # lands while the read is in flight
+        return values
+
+    spreadsheet.values_batch_get = read_then_write
+    gsheet_utils._sync_worksheets(spreadsheet, [CLOSED])
+
+    assert gsheet_utils.sync_errors == {}
+    assert list_archives() == []
+
+def test_a_damaged_archive_is_dropped_and_rebuilt(local_sheets):
+    spreadsheet = local_sheets({CLOSED: [debit_row('01-03-2020', 10)]})
+    load(spreadsheet)
+    with open(os.path.join(archive_path(CLOSED), 'rows.parquet'), 'ab') as f:
+        f.write(b'bit rot')
+
+    assert load_archive(CLOSED) is None
+    assert list_archives() == []
+
+    gsheet_utils.dataset_cache.clear()
+    reloaded = load(spreadsheet)  # served from the snapshot, revalidated in the background
+    assert reloaded[CLOSED]['debit'].tolist() == [-10]
+    deadline = time.monotonic() + 5
+    while CLOSED in gsheet_utils._sync_in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert list_archives() == [CLOSED]
+    assert load_archive(CLOSED)['manifest']['rows'] == 1
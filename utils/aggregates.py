@@ -0,0 +1,188 @@
+import threading
+
+import pandas as pd
+
+from utils.dataset_cache import frame_version
+from utils.instrumentation import span
+
+# 🧮 Bucket keys and the totals kept per bucket
+BUCKET_KEYS = ['year', 'month', 'iso_year', 'week', 'category']
+VALUE_COLUMNS = ['credit', 'debit', 'rows']
+
+DAILY_KEYS = ['day', 'category']
+
+def _period_key(key):
+    """Bucket key with int periods; rows without a parseable date keep their sheet's year and None for the rest."""
+    return tuple(k if i >= 4 else None if pd.isna(k) else int(k) for i, k in enumerate(key))
+
+def _bucketize(df):
+    """Groups a canonical frame into period buckets and (day, category) buckets in one vectorized pass each.
+
+    Both are returned as {key tuple: [credit, debit, rows]}. Undated rows count towards their sheet's
+    year and category (as the row-based totals did) but not towards any month, week or day.
+    """
+    if df is None or df.empty:
+        return {}, {}
+    dates = df['date']
+    sheet_year = pd.to_numeric(df['year'].astype(str), errors='coerce')
+    rows = pd.DataFrame({
+        'year': dates.dt.year.fillna(sheet_year),
+        'month': dates.dt.month,
+        'iso_year': df['iso_year'],
+        'week': df['week'],
+        'day': dates.dt.normalize(),
+        'category': df['category'].astype(str),
+        'credit': df['credit'].clip(lower=0),
+        'debit': df['debit'].clip(upper=0),
+        'rows': 1,
+    })
+
+    grouped = rows.groupby(BUCKET_KEYS, sort=False, dropna=False)[VALUE_COLUMNS].sum()
+    buckets = {
+        _period_key(key): list(values)
+        for key, values in zip(grouped.index, grouped.to_numpy().tolist())
+        if not pd.isna(key[0])
+    }
+    grouped = rows.groupby(DAILY_KEYS, sort=False)[VALUE_COLUMNS].sum()
+    daily = {key: list(values) for key, values in zip(grouped.index, grouped.to_numpy().tolist())}
+    return buckets, daily
+
+def _add_to_bucket(buckets, key, credit, debit):
+    totals = buckets.setdefault(key, [0, 0, 0])
+    totals[0] += max(credit, 0)
+    totals[1] += min(debit, 0)
+    totals[2] += 1
+
+class AggregateStore:
+    """Credit/debit totals per (year, month, ISO week, category) bucket for every yearly sheet.
+
+    Appending a transaction touches one bucket, so queries cost O(buckets) instead of O(rows).
+    Debits are stored as the (negative) sum of debit entries, credits as the sum of credits.
+    A parallel (day, category) table serves rolling windows such as the last 30/90/365 days.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._buckets = {}
+        self._daily = {}
+        self._sources = {}
+        self._frame = None
+        self.version = 0
+
+    def load_sheet(self, sheet_title, df):
+        with span('aggregates.bucketize', sheet=sheet_title, rows=len(df)):
+            buckets, daily = _bucketize(df)
+        with self._lock:
+            self._buckets[sheet_title] = buckets
+            self._daily[sheet_title] = daily
+            self._sources[sheet_title] = frame_version(df)
+            self._changed()
+
+    def add_rows(self, sheet_title, rows, frame=None):
+        """Adds already-canonical rows to their buckets (O(1) per row)."""
+        with self._lock:
+            buckets = self._buckets.setdefault(sheet_title, {})
+            daily = self._daily.setdefault(sheet_title, {})
+            for row in rows.itertuples(index=False):
+                category = str(row.category)
+                if pd.isna(row.date):
+                    if str(row.year).isdigit():
+                        _add_to_bucket(buckets, (int(row.year), None, None, None, category), row.credit, row.debit)
+                    continue
+                key = (row.date.year, row.date.month, int(row.iso_year), int(row.week), category)
+                _add_to_bucket(buckets, key, row.credit, row.debit)
+                _add_to_bucket(daily, (row.date.normalize(), category), row.credit, row.debit)
+            if frame is not None:
+                self._sources[sheet_title] = frame_version(frame)
+            self._changed()
+
+    def export_sheet(self, sheet_title):
+        """A sheet's (period, category) and (day, category) buckets as DataFrames, e.g. for archiving."""
+        with self._lock:
+            buckets = dict(self._buckets.get(sheet_title, {}))
+            daily = dict(self._daily.get(sheet_title, {}))
+        return (
+            pd.DataFrame.from_records([(*key, *values) for key, values in buckets.items()], columns=[*BUCKET_KEYS, *VALUE_COLUMNS]),
+            pd.DataFrame.from_records([(*key, *values) for key, values in daily.items()], columns=[*DAILY_KEYS, *VALUE_COLUMNS]),
+        )
+
+    def load_buckets(self, sheet_title, buckets, daily, frame=None):
+        """Restores buckets saved by export_sheet (no pass over the rows); `frame` marks them current."""
+        key_count = len(BUCKET_KEYS)
+        with self._lock:
+            self._buckets[sheet_title] = {
+                _period_key(record[:key_count]): list(record[key_count:])
+                for record in buckets[[*BUCKET_KEYS, *VALUE_COLUMNS]].itertuples(index=False, name=None)
+            }
+            self._daily[sheet_title] = {
+                (pd.Timestamp(record[0]), record[1]): list(record[2:])
+                for record in daily[[*DAILY_KEYS, *VALUE_COLUMNS]].itertuples(index=False, name=None)
+            }
+            if frame is not None:
+                self._sources[sheet_title] = frame_version(frame)
+            self._changed()
+
+    def ensure(self, sheet_title, df):
+        """Rebuilds a sheet's buckets only when `df` is not the frame they were built from."""
+        with self._lock:
+            current = self._sources.get(sheet_title) == frame_version(df)
+        if not current:
+            self.load_sheet(sheet_title, df)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+            self._daily.clear()
+            self._sources.clear()
+            self._changed()
+
+    def _changed(self):
+        self._frame = None
+        self.version += 1
+
+    def frame(self, sheet_titles=None):
+        """All buckets as a DataFrame (cached until the next change), optionally for some sheets only."""
+        with self._lock:
+            if self._frame is None:
+                records = [
+                    (title, *key, *values)
+                    for title, buckets in self._buckets.items()
+                    for key, values in buckets.items()
+                ]
+                frame = pd.DataFrame.from_records(records, columns=['sheet', *BUCKET_KEYS, *VALUE_COLUMNS])
+                frame['category_lower'] = frame['category'].str.lower()
+                frame['month_year'] = pd.PeriodIndex(
+                    pd.to_datetime(dict(year=frame['year'], month=frame['month'], day=1)), freq='M'
+                ) if not frame.empty else pd.PeriodIndex([], freq='M')
+                self._frame = frame
+            frame = self._frame
+        if sheet_titles is not None:
+            frame = frame[frame['sheet'].isin(list(sheet_titles))]
+        return frame
+
+    def daily_frame(self, sheet_titles=None, cutoff=None):
+        """(day, category) buckets (from `cutoff` on), with the same value columns as `frame()`."""
+        with self._lock:
+            titles = self._daily.keys() if sheet_titles is None else [t for t in sheet_titles if t in self._daily]
+            records = [
+                (title, *key, *values)
+                for title in titles
+                for key, values in self._daily[title].items()
+                if cutoff is None or key[0] >= cutoff
+            ]
+        frame = pd.DataFrame.from_records(records, columns=['sheet', *DAILY_KEYS, *VALUE_COLUMNS])
+        frame['category_lower'] = frame['category'].str.lower()
+        return frame
+
+    def window_frame(self, days, today=None, sheet_titles=None):
+        """(day, category) buckets of the last `days` days."""
+        cutoff = pd.Timestamp(today or pd.Timestamp.today()).normalize() - pd.Timedelta(days=days - 1)
+        return self.daily_frame(sheet_titles, cutoff)
+
+aggregate_store = AggregateStore()
+
+def get_aggregates(yearly_data):
+    """Returns the shared store after making sure it reflects every frame in `yearly_data`."""
+    for sheet_title, df in yearly_data.items():
+        aggregate_store.ensure(sheet_title, df)
+    return aggregate_store
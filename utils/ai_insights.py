@@ -1,44 +1,34 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
+from utils.aggregates import get_aggregates
+from utils.chart_cache import cached_chart
+from utils.insights_engine import get_insights, WINDOWS
+from utils.forecast_engine import get_forecast
+from utils.instrumentation import traced
 
-def generate_storytelling(df):
+def generate_storytelling(result):
     st.markdown("## 🔮 Predictive Spending Analytics")
 
-    if df.empty:
+    if not result.has_data:
         st.info("No data available for insights.")
         return
 
-    # Prepare data - exclude fixed/investment categories
-    fixed_categories = ['sip', 'rent,maid & electricity bills', 'financial support to family']
-    expense_df = df[~df['category'].str.lower().isin([cat.lower() for cat in fixed_categories])]
-    
-    if expense_df.empty:
+    profile = result.profile
+    if profile is None:
         st.info("No discretionary expenses to analyze.")
         return
     
-    # Calculate category percentages
-    category_totals = expense_df.groupby('category')['debit'].sum().abs()
-    total_discretionary = category_totals.sum()
-    category_percentages = (category_totals / total_discretionary * 100).round(1)
-    
     st.markdown("---")
     
     # 1. SPENDING PERSONALITY
     st.markdown("### 🧠 Spending Personality")
     
     # Daily vs Weekend vs Planned analysis
-    daily_pct = category_percentages.get('Today\'s expense ', 0)
-    weekend_pct = category_percentages.get('Weekend expense', 0)
-    shopping_pct = category_percentages.get('Shopping', 0)
-    trips_pct = category_percentages.get('Trips', 0) + category_percentages.get('Travelling expense', 0)
-    
-    spontaneous_pct = daily_pct + weekend_pct
-    planned_pct = shopping_pct + trips_pct
+    spontaneous_pct, planned_pct = profile.spontaneous_pct, profile.planned_pct
     
-    if spontaneous_pct > 50:
+    if profile.personality == 'spontaneous':
         st.markdown(f"• **Spontaneous Spender** ({spontaneous_pct:.1f}%): You prefer in-the-moment purchases over planned spending")
-    elif planned_pct > 40:
+    elif profile.personality == 'planned':
         st.markdown(f"• **Strategic Planner** ({planned_pct:.1f}%): You favor planned purchases and experiences")
     else:
         st.markdown(f"• **Balanced Decision Maker**: {spontaneous_pct:.1f}% spontaneous vs {planned_pct:.1f}% planned spending")
@@ -47,10 +37,8 @@ def generate_storytelling(df):
     st.markdown("### 🏠 Lifestyle Profile")
     
     # Get top spending category
-    if len(category_percentages) > 0:
-        top_category = category_percentages.idxmax()
-        top_percentage = category_percentages.max()
-        
+    top_category, top_percentage = profile.top_category, profile.top_percentage
+    if top_category is not None:
         lifestyle_profiles = {
             "Today's expense ": f"**Daily Comfort Seeker** ({top_percentage:.1f}%): Your largest expense is daily pleasures and immediate needs",
             "Weekend expense": f"**Weekend Warrior** ({top_percentage:.1f}%): You invest most in weekend entertainment and relaxation",
@@ -71,15 +59,11 @@ def generate_storytelling(df):
     st.markdown("### ⚖️ Spending Balance")
     
     # Essential vs Lifestyle balance
-    essential_categories = ['Veggies,Gas cylinder and Dmart', 'Petrol', 'Recharge']
-    lifestyle_categories = ['Shopping', 'Self Care', 'Trips', 'Weekend expense', 'Travelling expense','Pune & village expense']
-    
-    essential_pct = sum([category_percentages.get(cat, 0) for cat in essential_categories])
-    lifestyle_pct = sum([category_percentages.get(cat, 0) for cat in lifestyle_categories])
+    essential_pct, lifestyle_pct = profile.essential_pct, profile.lifestyle_pct
     
-    if essential_pct > lifestyle_pct:
+    if profile.balance == 'practical':
         st.markdown(f"• **Practical Prioritizer**: {essential_pct:.1f}% essentials vs {lifestyle_pct:.1f}% lifestyle - You focus on needs first")
-    elif lifestyle_pct > essential_pct * 1.5:
+    elif profile.balance == 'lifestyle':
         st.markdown(f"• **Lifestyle Investor**: {lifestyle_pct:.1f}% lifestyle vs {essential_pct:.1f}% essentials - You invest in experiences")
     else:
         st.markdown(f"• **Balanced Living**: {essential_pct:.1f}% essentials vs {lifestyle_pct:.1f}% lifestyle - Well-balanced approach")
@@ -88,12 +72,11 @@ def generate_storytelling(df):
     st.markdown("### 📊 Financial Behavior")
     
     # Transaction pattern analysis
-    avg_transaction = abs(expense_df['debit'].mean())
-    transaction_count = len(expense_df)
+    transaction_count, avg_transaction = profile.transaction_count, profile.avg_transaction
     
-    if avg_transaction < 200 and transaction_count > 20:
+    if profile.behavior == 'frequent_small':
         st.markdown(f"• **Frequent Small Spender**: {transaction_count} transactions averaging ₹{avg_transaction:.0f} - You prefer many small purchases")
-    elif avg_transaction > 1000 and transaction_count < 15:
+    elif profile.behavior == 'bulk':
         st.markdown(f"• **Bulk Decision Maker**: {transaction_count} transactions averaging ₹{avg_transaction:.0f} - You make fewer, larger purchases")
     else:
         st.markdown(f"• **Moderate Spender**: {transaction_count} transactions averaging ₹{avg_transaction:.0f} - Balanced transaction pattern")
@@ -102,13 +85,10 @@ def generate_storytelling(df):
     st.markdown("### 🎯 Smart Focus")
     
     # Focus on top spending area
-    if len(category_percentages) > 0:
-        top_category = category_percentages.idxmax()
-        top_percentage = category_percentages.max()
-        
-        if top_percentage > 40:
+    if top_category is not None:
+        if profile.focus == 'concentrated':
             st.markdown(f"• **High Concentration Alert**: {top_percentage:.1f}% of spending is in '{top_category}' - Consider diversifying or optimizing this category")
-        elif top_percentage < 15:
+        elif profile.focus == 'distributed':
             st.markdown(f"• **Well-Distributed Spending**: Your largest category '{top_category}' is only {top_percentage:.1f}% - Good spending diversity")
         else:
             st.markdown(f"• **Optimization Opportunity**: Focus on '{top_category}' ({top_percentage:.1f}% of spending) for maximum savings impact")
@@ -116,57 +96,10 @@ def generate_storytelling(df):
     st.markdown("---")
 
 
-def generate_financial_health_score(df):
-    st.markdown("## 💯 Financial Health Score")
-    
-    if df.empty:
-        st.info("No data available for score calculation.")
-        return
-    
-    # Calculate income and expenses
-    total_income = df[df['credit'] > 0]['credit'].sum()
-    total_expenses = abs(df[df['debit'] < 0]['debit'].sum())
-    
-    if total_income <= 0:
-        st.warning("No income data found. Cannot calculate financial health score.")
-        return
-    
-    # Calculate savings rate
-    net_savings = total_income - total_expenses
-    savings_rate = (net_savings / total_income) * 100
-   
-    # Calculate financial health score (0-100)
-    # Base score from savings rate
-    base_score = max(0, min(100, savings_rate * 2))  # 50% savings = 100 score
-
-    # Adjust for spending behavior
-    fixed_categories = ['sip', 'rent,maid & electricity bills', 'financial support to family']
-    fixed_expenses = abs(df[df['category'].str.lower().isin(fixed_categories)]['debit'].sum())
-    discretionary_expenses = total_expenses - fixed_expenses
-    
-    # Bonus/Penalty adjustments
-    adjustments = 0
-    
-    # SIP Investment Bonus (up to +15 points)
-    sip_amount = abs(df[df['category'].str.lower() == 'sip']['debit'].sum())
-    if sip_amount > 0:
-        sip_ratio = (sip_amount / total_income) * 100
-        adjustments += min(15, sip_ratio * 1.5)  # Max 15 points for 10%+ SIP
-    
-    # Discretionary spending penalty/bonus
-    discretionary_ratio = (discretionary_expenses / total_income) * 100
-    if discretionary_ratio > 60:
-        adjustments -= 10  # High discretionary spending penalty
-    elif discretionary_ratio < 30:
-        adjustments += 10  # Low discretionary spending bonus
-    
-    # Final score calculation
-    final_score = max(0, min(100, base_score + adjustments))
-  
-    # Create gauge chart
+def _build_health_gauge(score):
     fig = go.Figure(go.Indicator(
         mode = "gauge+number+delta",
-        value = final_score,
+        value = score,
         domain = {'x': [0, 1], 'y': [0, 1]},
         title = {'text': "Financial Health Score", 'font': {'size': 24, 'weight': 700}},
         delta = {'reference': 50, 'increasing': {'color': "green"}, 'decreasing': {'color': "red"}},
@@ -196,6 +129,25 @@ def generate_financial_health_score(df):
         font={'color': "darkblue", 'family': "Arial"},
         paper_bgcolor="white"
     )
+    return fig
+
+def generate_financial_health_score(result):
+    st.markdown("## 💯 Financial Health Score")
+    
+    if not result.has_data:
+        st.info("No data available for score calculation.")
+        return
+    
+    health = result.health
+    if health is None:
+        st.warning("No income data found. Cannot calculate financial health score.")
+        return
+    
+    final_score = health.score
+    savings_rate, sip_ratio, discretionary_ratio = health.savings_rate, health.sip_ratio, health.discretionary_ratio
+  
+    # Create gauge chart (rebuilt only when the score changes)
+    fig = cached_chart('health_gauge', _build_health_gauge, final_score)
     
     # Display the gauge
     st.plotly_chart(fig, use_container_width=True)
@@ -213,7 +165,6 @@ def generate_financial_health_score(df):
         )
     
     with col2:
-        sip_ratio = (sip_amount / total_income * 100) if total_income > 0 else 0
         st.metric(
             label="📈 Investment Rate", 
             value=f"{sip_ratio:.1f}%",
@@ -221,7 +172,6 @@ def generate_financial_health_score(df):
         )
     
     with col3:
-        discretionary_ratio = (discretionary_expenses / total_income * 100) if total_income > 0 else 0
         st.metric(
             label="🎯 Lifestyle Spending", 
             value=f"{discretionary_ratio:.1f}%",
@@ -230,19 +180,19 @@ def generate_financial_health_score(df):
     
     st.markdown("### 🎯 Your Financial Profile & Next Steps")
     
-    if final_score >= 85:
+    if health.tier == 'champion':
         st.success("**🌟 Financial Champion** - Excellent money management! Your disciplined approach puts you in the top tier.")
         st.markdown("• **Next Steps**: Explore advanced investments and automate transfers to maximize growth")
         
-    elif final_score >= 75:
+    elif health.tier == 'achiever':
         st.success("**💪 Financial Achiever** - Very good financial health with positive savings rate!")
         st.markdown(f"• **Next Steps**: {'Increase SIP investments' if sip_ratio < 15 else 'Optimize with tax-saving investments'} for champion level")
         
-    elif final_score >= 60:
+    elif health.tier == 'balancer':
         st.warning("**⚖️ Financial Balancer** - Good foundation, room for improvement")
         st.markdown(f"• **Next Steps**: Reduce discretionary spending by 5-10% and boost SIP by ₹1000-2000 monthly")
         
-    elif final_score >= 40:
+    elif health.tier == 'attention':
         st.warning("**⚠️ Financial Attention Needed** - Time to refocus priorities")
         st.markdown(f"• **Next Steps**: Build emergency fund first, then follow 50/30/20 rule (50% needs, 30% wants, 20% savings)")
         
@@ -255,7 +205,41 @@ def generate_financial_health_score(df):
 
     st.markdown("---")
 
+def generate_year_end_outlook(forecast, top=5):
+    st.markdown("## 📈 Year-End Outlook")
+
+    if not forecast.has_data:
+        st.info("Not enough history to project the rest of the year.")
+        return
+
+    totals = forecast.totals
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="💸 Projected Spend", value=f"₹{totals['debit_year_end']:,.0f}",
+                  delta=f"₹{totals['debit_year_to_date']:,.0f} so far", delta_color="off")
+    with col2:
+        st.metric(label="💰 Projected Income", value=f"₹{totals['credit_year_end']:,.0f}",
+                  delta=f"₹{totals['credit_year_to_date']:,.0f} so far", delta_color="off")
+    with col3:
+        rate = totals['savings_year_end'] / totals['credit_year_end'] * 100 if totals['credit_year_end'] > 0 else None
+        st.metric(label="🐖 Projected Savings", value=f"₹{totals['savings_year_end']:,.0f}",
+                  delta=f"{rate:.1f}% of income" if rate is not None else None)
+
+    st.markdown("### 🧾 Where the Rest of the Year Goes")
+    biggest = forecast.categories.sort_values('debit_year_end', ascending=False).head(top)
+    for category, row in biggest.iterrows():
+        still_to_come = row['debit_year_end'] - row['debit_year_to_date']
+        st.markdown(f"• **{category.strip()}**: about ₹{row['debit_year_end']:,.0f} by December "
+                    f"(₹{still_to_come:,.0f} still to come)")
+    st.caption(f"Projected from day-of-month spending curves and seasonal patterns of every year, as of {forecast.as_of:%d %b %Y}.")
+
+@traced()
 def show_ai_insights(yearly_data):
-    all_data = pd.concat(yearly_data.values(), ignore_index=True)
-    generate_financial_health_score(all_data)
-    generate_storytelling(all_data)
+    window = st.radio("Analyze:", list(WINDOWS), horizontal=True)
+
+    # Scored from the shared aggregate buckets; cached until the next transaction lands
+    aggregates = get_aggregates(yearly_data)
+    result = get_insights(aggregates, yearly_data.keys(), WINDOWS[window])
+    generate_financial_health_score(result)
+    generate_storytelling(result)
+    generate_year_end_outlook(get_forecast(aggregates, yearly_data.keys()))
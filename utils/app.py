@@ -1,14 +1,25 @@
+import importlib
+import time
 import streamlit as st
 from streamlit_option_menu import option_menu  # 🆕 Import
 
-from utils.gsheet_utils import load_data_from_gsheet, load_yearly_data
+from utils.gsheet_utils import load_data_from_gsheet, get_yearly_data, current_sheet_title, start_prefetch
 from utils.data_utils import filter_old_records
-from utils.ui_utils import show_credit_form, show_debit_form, show_summary
-from utils.yearly_overview import show_yearly_overview
-from utils.monthly_insights import generate_monthly_insights
-from utils.weekly_insights import generate_weekly_insights
-from utils.filter_data import filter_data
-from utils.ai_insights import show_ai_insights
+from utils.aggregates import get_aggregates
+from utils.ui_utils import show_credit_form, show_debit_form, show_prefetch_status
+from utils.instrumentation import begin_rerun, end_rerun, span, logger
+
+# 💤 Page modules (and their plotting libraries) are imported on first use, not at login
+import_times = {}  # module -> seconds its first import took
+
+def load_page(module_name, function_name):
+    if module_name not in import_times:
+        start = time.perf_counter()
+        with span('import', module=module_name):
+            importlib.import_module(module_name)
+        import_times[module_name] = time.perf_counter() - start
+        logger.info("imported %s in %.0f ms", module_name, import_times[module_name] * 1000)
+    return getattr(importlib.import_module(module_name), function_name)
 
 def run():
 
@@ -18,41 +29,67 @@ def run():
         options=[
             "Credit", "Debit", "Summary", 
             "Weekly Insights", "Monthly Insights", 
-            "Yearly Overview", "Filter", "AI Insights"
+            "Yearly Overview", "Filter", "Search", "AI Insights", "Import"
         ],
         icons=["cash", "credit-card", "bar-chart-line", 
-           "calendar-week", "graph-up", "calendar-range", "search", "robot"],
+           "calendar-week", "graph-up", "calendar-range", "search", "binoculars", "robot", "upload"],
         menu_icon="cast",
         default_index=0,
         orientation="horizontal",
         # show_icons=False  # ✅ Only works here
     )
 
+    # ⏱️ Spans, API calls and bytes of this rerun (shown to admins below the page)
+    trace = begin_rerun(selected)
+    try:
+        with span(f"page {selected}"):
+            show_page(selected)
+    finally:
+        if st.session_state.get('is_admin'):
+            load_page("utils.debug_panel", "show_debug_panel")(trace, import_times)
+        end_rerun()
+
+def show_page(selected):
     # Load and prepare data
     df, sheet, spreadsheet = load_data_from_gsheet()
+    if sheet is None:
+        st.warning("📴 Google Sheets is unreachable, showing your last local snapshot. New entries stay queued.")
+    start_prefetch(spreadsheet)  # 🚚 Warm the yearly sheets while the forms are in use
+    aggregates = get_aggregates({current_sheet_title(): df})
     df = filter_old_records(df)
+    malformed = df.attrs.get('malformed_rows', 0) if df is not None else 0
+    if malformed:
+        st.caption(f"⚠️ {malformed} row(s) have an unreadable date and are always shown. Fix them in the sheet.")
 
     # 📦 Route to selected feature
     if selected == "Credit":
         show_credit_form(df, sheet)
+        show_prefetch_status()
 
     elif selected == "Debit":
         show_debit_form(df, sheet)
+        show_prefetch_status()
 
     elif selected == "Summary":
-        show_summary(load_yearly_data(spreadsheet))
+        load_page("utils.ui_utils", "show_summary")(get_yearly_data(spreadsheet))
 
     elif selected == "Weekly Insights":
-        generate_weekly_insights(df)
+        load_page("utils.weekly_insights", "generate_weekly_insights")(df, aggregates)
 
     elif selected == "Monthly Insights":
-        generate_monthly_insights(df)
+        load_page("utils.monthly_insights", "generate_monthly_insights")(df, aggregates)
 
     elif selected == "Yearly Overview":
-        show_yearly_overview(load_yearly_data(spreadsheet))
+        load_page("utils.yearly_overview", "show_yearly_overview")(get_yearly_data(spreadsheet))
 
     elif selected == "Filter":
-        filter_data(load_yearly_data(spreadsheet))
+        load_page("utils.filter_data", "filter_data")(get_yearly_data(spreadsheet))
+
+    elif selected == "Search":
+        load_page("utils.search_data", "show_search")(get_yearly_data(spreadsheet))
 
     elif selected == "AI Insights":
-        show_ai_insights(load_yearly_data(spreadsheet))
+        load_page("utils.ai_insights", "show_ai_insights")(get_yearly_data(spreadsheet))
+
+    elif selected == "Import":
+        load_page("utils.import_data", "show_import")(spreadsheet, get_yearly_data(spreadsheet))
@@ -0,0 +1,131 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.dataset_cache import dataset_version
+from utils.search_index import TOKEN_PATTERN
+
+# 🤖 Category suggestions for typed and imported transactions (whole batches, no per-row Python loops)
+DEFAULT_CATEGORY = 'Other'
+MIN_TOKEN_COUNT = 2  # tokens seen fewer times in history don't vote
+LEARNED_MIN_CONFIDENCE = 0.6  # history beats the keyword rules from this share of the vote
+
+# Keyword rules, first match wins (lower-cased details text)
+DEBIT_RULES = [
+    ('SIP', r'\bsip\b|mutual fund|\belss\b|groww|zerodha|\bnps\b'),
+    ('Rent,Maid & Electricity bills', r'\brent\b|\bmaid\b|electricity|power bill|msedcl|bescom|tata power'),
+    ('Recharge', r'recharge|\bdth\b|\bjio\b|airtel|vodafone|\bbsnl\b|tata play'),
+    ('Petrol', r'petrol|diesel|\bfuel\b|\bhpcl\b|\bbpcl\b|\biocl\b|indian oil'),
+    ('Veggies,Gas cylinder and Dmart', r'd-?mart|vegetable|veggies|gas cylinder|\blpg\b|bigbasket|blinkit|zepto'),
+    ('Financial Support to Family', r'parents|family|sibling|\bmom\b|\bdad\b'),
+    ('Self Care', r'salon|\bspa\b|\bgym\b|pharmacy|medical|apollo|doctor|clinic'),
+    ('Travelling expense', r'\btaxi\b|\buber\b|\bola\b|rapido|irctc|train|flight|\bbus\b|redbus|metro|hotel'),
+    ('Trips', r'\btrip\b|vacation|makemytrip|goibibo|\boyo\b|airbnb'),
+    ('Pune & village expense', r'\bpune\b|village'),
+    ('Weekend expense', r'movie|pvr|inox|bookmyshow|outing|lunch|dinner'),
+    ('Shopping', r'amazon|flipkart|myntra|\bajio\b|shopping|clothes|electronics'),
+    ("Today's expense ", r'swiggy|zomato|\btea\b|coffee|snacks|stationery|grocery|cafe'),
+]
+CREDIT_RULES = [
+    ('Salary', r'salary|payroll|\bsal\b'),
+    ('Udemy Income', r'udemy'),
+    ('Youtube Earning', r'adsense|youtube.*(?:payout|earning|revenue)|google asia pacific'),  # AdSense/YouTube payouts only
+    ('Side Income', r'freelance|upwork|fiverr|consult'),
+]
+
+def _normalize_text(details):
+    text = pd.Series(details, dtype=object).fillna('').astype(str).str.lower()
+    return text.mask(text.str.strip() == 'na', '')
+
+def apply_rules(text, rules):
+    """First matching rule's category per row (None where no rule matches)."""
+    if not len(text):
+        return np.array([], dtype=object)
+    masks = [text.str.contains(pattern, regex=True).to_numpy() for _, pattern in rules]
+    return np.select(masks, [category for category, _ in rules], default=None).astype(object)
+
+class Categorizer:
+    """Keyword rules plus a token → category vote table learned from the existing sheets."""
+
+    def __init__(self, yearly_data=None):
+        self._tables = {True: pd.DataFrame(), False: pd.DataFrame()}
+        frames = [df for df in (yearly_data or {}).values() if df is not None and not df.empty]
+        if frames:
+            history = pd.concat([df[['credit', 'credit_details', 'debit_details', 'category']] for df in frames], ignore_index=True)
+            is_credit = (history['credit'] > 0).to_numpy()
+            details = pd.Series(np.where(is_credit, history['credit_details'], history['debit_details']))
+            for credit_side in (True, False):
+                side = is_credit == credit_side
+                self._tables[credit_side] = self._learn(details[side], history['category'].astype(str)[side])
+
+    @staticmethod
+    def _learn(details, categories):
+        """P(category | token) for every token seen at least MIN_TOKEN_COUNT times."""
+        tokens = _normalize_text(details.to_numpy()).str.findall(TOKEN_PATTERN)
+        pairs = pd.DataFrame({'token': tokens.to_numpy(), 'category': categories.to_numpy()}).explode('token').dropna()
+        pairs = pairs[pairs['category'].str.strip() != '']
+        if pairs.empty:
+            return pd.DataFrame()
+        counts = pairs.value_counts().rename('count').reset_index()
+        totals = counts.groupby('token')['count'].transform('sum')
+        counts['weight'] = counts['count'] / totals
+        return counts[totals >= MIN_TOKEN_COUNT][['token', 'category', 'weight']]
+
+    def _learned(self, text, credit_side):
+        """(category, confidence) per row from the learned table (None / 0 where no known token)."""
+        categories = np.full(len(text), None, dtype=object)
+        confidence = np.zeros(len(text))
+        table = self._tables[credit_side]
+        if table.empty or not len(text):
+            return categories, confidence
+
+        tokens = text.str.findall(TOKEN_PATTERN).explode().dropna()
+        votes = pd.DataFrame({'row': tokens.index.to_numpy(), 'token': tokens.to_numpy()}).merge(table, on='token')
+        if votes.empty:
+            return categories, confidence
+        matched = votes.groupby('row')['token'].nunique()
+        scores = votes.groupby(['row', 'category'])['weight'].sum().reset_index()
+        best = scores.sort_values('weight', ascending=False, kind='stable').drop_duplicates('row').set_index('row')
+        rows = best.index.to_numpy()
+        categories[rows] = best['category'].to_numpy()
+        confidence[rows] = (best['weight'] / matched.reindex(best.index)).to_numpy()
+        return categories, confidence
+
+    def categorize(self, details, is_credit):
+        """Suggested category for every row: confident history, then keyword rules, then any history, then DEFAULT_CATEGORY."""
+        text = _normalize_text(details).reset_index(drop=True)
+        is_credit = np.broadcast_to(np.asarray(is_credit, dtype=bool), len(text))
+        result = np.full(len(text), DEFAULT_CATEGORY, dtype=object)
+        for credit_side, rules in ((True, CREDIT_RULES), (False, DEBIT_RULES)):
+            side = np.flatnonzero(is_credit == credit_side)
+            if side.size == 0:
+                continue
+            side_text = text.iloc[side].reset_index(drop=True)
+            learned, confidence = self._learned(side_text, credit_side)
+            ruled = apply_rules(side_text, rules)
+            picked = np.where((confidence >= LEARNED_MIN_CONFIDENCE) | pd.isna(ruled), learned, ruled)
+            result[side] = np.where(pd.isna(picked), DEFAULT_CATEGORY, picked)
+        return result
+
+    def suggest(self, details, is_credit=False, options=None):
+        """Single-row suggestion, or None when it isn't one of `options`."""
+        category = self.categorize([details], is_credit)[0]
+        if options is not None and category not in options:
+            ruled = apply_rules(_normalize_text([details]), CREDIT_RULES if is_credit else DEBIT_RULES)[0]
+            category = ruled if ruled in options else None
+        return category
+
+# ♻️ Relearned only when the underlying yearly frames change
+_categorizer_lock = threading.Lock()
+_categorizer = {'key': None, 'value': None}
+
+def get_categorizer(yearly_data):
+    key = dataset_version(yearly_data)
+    with _categorizer_lock:
+        if _categorizer['key'] == key:
+            return _categorizer['value']
+    categorizer = Categorizer(yearly_data)
+    with _categorizer_lock:
+        _categorizer.update(key=key, value=categorizer)
+    return categorizer
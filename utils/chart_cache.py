@@ -0,0 +1,61 @@
+from collections import OrderedDict
+import hashlib
+import threading
+
+import pandas as pd
+
+from utils.instrumentation import span
+
+# 🖼️ LRU cache of built charts (Altair/Plotly objects, rendered matplotlib PNG bytes)
+CHART_CACHE_SIZE = 64
+
+def fingerprint(*inputs):
+    """Content hash of the chart inputs (DataFrames are hashed by value, everything else by repr)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in inputs:
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        else:
+            digest.update(repr(value).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+class ChartCache:
+    def __init__(self, max_size=CHART_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._charts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, builder):
+        with self._lock:
+            if key in self._charts:
+                self._charts.move_to_end(key)
+                self.hits += 1
+                return self._charts[key]
+            self.misses += 1
+        with span('chart.build', chart=key[0]):
+            chart = builder()
+        with self._lock:
+            self._charts[key] = chart
+            self._charts.move_to_end(key)
+            while len(self._charts) > self.max_size:
+                self._charts.popitem(last=False)
+        return chart
+
+    def clear(self):
+        with self._lock:
+            self._charts.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._charts)}
+
+chart_cache = ChartCache()
+
+def cached_chart(name, builder, *inputs):
+    """Returns builder(*inputs), reusing the chart built for identical inputs."""
+    return chart_cache.get_or_build((name, fingerprint(*inputs)), lambda: builder(*inputs))
@@ -1,23 +1,83 @@
 from datetime import datetime
 import pandas as pd
 
+from utils.instrumentation import span
+
+DATE_FORMAT = '%d-%m-%Y'
+MINOR_UNITS = 100  # paise per rupee
+
+def to_minor_units(series):
+    """Amounts as int64 paise (blank or non-numeric cells count as 0)."""
+    return (pd.to_numeric(series, errors='coerce').fillna(0) * MINOR_UNITS).round().astype('int64')
+
 def get_current_date_month():
     """Returns current date as (DD-MM-YYYY, MonthName)."""
     now = datetime.today()
     return now.strftime('%d-%m-%Y'), now.strftime('%B')
 
-def filter_old_records(df, threshold=350):
-    """Filter out records older than `threshold` days."""
-    today = pd.to_datetime(datetime.today(), dayfirst=True)
+def parse_dates(series):
+    """Parses DD-MM-YYYY strings in one vectorized pass (datetimes are returned as is)."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    dates = pd.to_datetime(series, format=DATE_FORMAT, errors='coerce')
+    retry = dates.isna() & series.notna() & (series.astype(str).str.strip() != '')
+    if retry.any():
+        dates[retry] = pd.to_datetime(series[retry].astype(str), format='mixed', dayfirst=True, errors='coerce')
+    return dates
+
+def filter_old_records(df, threshold=350, start=None, end=None):
+    """Keep records from the last `threshold` days, or between `start` and `end` (inclusive) when given.
+
+    Rows with malformed dates are kept; their count is stored in `result.attrs['malformed_rows']`.
+    """
+    if df is None or df.empty or 'date' not in df:
+        return df
+
+    with span('filter_old_records', rows=len(df)) as attrs:
+        dates = parse_dates(df['date'])
+        malformed = dates.isna()
+
+        if start is None and end is None:
+            start = pd.Timestamp(datetime.today()).normalize() - pd.Timedelta(days=threshold)
+        keep = malformed.copy()
+        in_window = pd.Series(True, index=df.index)
+        if start is not None:
+            in_window &= dates >= pd.Timestamp(start)
+        if end is not None:
+            in_window &= dates <= pd.Timestamp(end)
+        keep |= in_window
+
+        result = df[keep].reset_index(drop=True)
+        result.attrs['malformed_rows'] = int(malformed.sum())
+        attrs['kept'] = len(result)
+    return result
+
+# 📅 Period keys understood by summarize_periods (columns of the canonical frame / aggregate buckets)
+PERIOD_KEYS = {
+    'day': ['date'],
+    'week': ['iso_year', 'week'],
+    'month': ['month_year'],
+    'year': ['year'],
+}
 
-    def is_recent(row):
-        try:
-            row_date = pd.to_datetime(row['date'], dayfirstx=True)
-            return (today - row_date).days <= threshold
-        except Exception:
-            return True  # Skip malformed rows
+def summarize_periods(data, keys):
+    """Credit, debit, savings and %-change columns per period in one vectorized pass.
 
-    return df[df.apply(is_recent, axis=1)].reset_index(drop=True)
+    `keys` is a PERIOD_KEYS name or a list of columns. Works on raw rows and on aggregate buckets alike.
+    """
+    if isinstance(keys, str):
+        keys = PERIOD_KEYS[keys]
+    summary = (
+        data.assign(debit=data['debit'].clip(upper=0), credit=data['credit'].clip(lower=0))
+        .groupby(keys, observed=True)[['debit', 'credit']].sum()
+        .reset_index()
+    )
+    summary['debit'] = summary['debit'].abs()
+    summary['savings'] = summary['credit'] - summary['debit']
+    summary['Spend change(%)'] = summary['debit'].pct_change().fillna(0) * 100
+    summary['Income change(%)'] = summary['credit'].pct_change().fillna(0) * 100
+    summary['Savings change(%)'] = summary['savings'].pct_change().fillna(0) * 100
+    return summary
 
 def _format_transaction_df(df, type_col, details_col):
     """Formats credit or debit dataframe with consistent structure."""
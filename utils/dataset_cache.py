@@ -0,0 +1,122 @@
+import itertools
+import os
+import threading
+import time
+import weakref
+
+import pandas as pd
+
+# ⏱️ Upper bound on how long a cached worksheet is trusted without our own writes
+DATASET_TTL = float(os.environ.get("EXPENSE_TRACKER_DATASET_TTL", 300))
+
+# 🏷️ Version token per frame object: unlike id(), which is handed to a new frame once the old one is
+# collected, a token is never reused. Indexes derived from yearly frames are keyed on these.
+_versions = {}
+_versions_lock = threading.Lock()
+_next_version = itertools.count(1)
+
+def _forget(ref, key):
+    if _versions.get(key, (None,))[0] is ref:
+        _versions.pop(key, None)
+
+def frame_version(df):
+    with _versions_lock:
+        entry = _versions.get(id(df))
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+        key = id(df)
+        _versions[key] = (weakref.ref(df, lambda ref: _forget(ref, key)), next(_next_version))
+        return _versions[key][1]
+
+def dataset_version(yearly_data):
+    """{sheet title: frame} → a key that changes whenever any of the frames is replaced."""
+    return tuple((title, frame_version(df)) for title, df in sorted(yearly_data.items()))
+
+def _nbytes(value):
+    return int(value.memory_usage(index=False).sum()) if isinstance(value, pd.DataFrame) else 0
+
+class DatasetCache:
+    """Parsed worksheet DataFrames keyed by (spreadsheet id, title) and revision.
+
+    Our own writes bump the revision of the worksheet they touch; anything else expires after `ttl`.
+    A cached frame is one copy shared by every session and is never modified in place: pandas
+    Copy-on-Write (always on from pandas 3) gives filters, assign and concat on it their own copy
+    as soon as either side writes, so a session's edits never leak into the shared frame.
+    """
+
+    def __init__(self, ttl=DATASET_TTL):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._revisions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def revision(self, spreadsheet_id, name):
+        with self._lock:
+            return self._revisions.get((spreadsheet_id, name), 0)
+
+    def get(self, spreadsheet_id, name):
+        """Returns the cached value or None when missing, stale or out of revision."""
+        key = (spreadsheet_id, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            fresh = (
+                entry is not None
+                and entry['revision'] == self._revisions.get(key, 0)
+                and time.monotonic() - entry['loaded_at'] <= self.ttl
+            )
+            if fresh:
+                self.hits += 1
+                return entry['value']
+            self.misses += 1
+            return None
+
+    def peek(self, spreadsheet_id, name):
+        """Returns the last stored value even when stale (for serve-while-revalidating)."""
+        with self._lock:
+            entry = self._entries.get((spreadsheet_id, name))
+            return entry['value'] if entry is not None else None
+
+    def put(self, spreadsheet_id, name, value, revision=None):
+        """Stores a value. Pass the revision read before fetching so a concurrent write wins.
+
+        Returns False (and keeps the existing entry) when `revision` is older than the stored one.
+        """
+        key = (spreadsheet_id, name)
+        with self._lock:
+            if revision is None:
+                revision = self._revisions.get(key, 0)
+            existing = self._entries.get(key)
+            if existing is not None and existing['revision'] > revision:
+                return False
+            self._entries[key] = {'value': value, 'revision': revision, 'loaded_at': time.monotonic()}
+            return True
+
+    def invalidate(self, spreadsheet_id, name=None):
+        """Bumps the revision of one worksheet, or of every entry of the spreadsheet."""
+        with self._lock:
+            keys = [(spreadsheet_id, name)] if name is not None else [
+                key for key in self._entries if key[0] == spreadsheet_id
+            ]
+            for key in keys:
+                self._revisions[key] = self._revisions.get(key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._revisions.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'shared_bytes': sum(_nbytes(entry['value']) for entry in self._entries.values()),
+            }
+
+dataset_cache = DatasetCache()
@@ -0,0 +1,60 @@
+import streamlit as st
+import pandas as pd
+from utils.chart_cache import chart_cache
+from utils.dataset_cache import dataset_cache
+from utils.gsheet_utils import prefetch_status, sync_errors
+from utils.instrumentation import background_trace, export_chrome_trace, export_log_lines
+from utils.sheets_scheduler import sheets_scheduler
+from utils.sheet_registry import sheet_registry
+
+# 🛠️ Admin-only timing panel for the current rerun (spans, API calls, bytes, cache stats)
+def _spans_table(trace):
+    spans = list(trace.spans)
+    if not spans:
+        return pd.DataFrame(columns=['span', 'offset (ms)', 'duration (ms)', 'thread', 'details'])
+    return pd.DataFrame({
+        'span': [span['name'] for span in spans],
+        'offset (ms)': [round((span['start'] - trace.start) * 1000, 1) for span in spans],
+        'duration (ms)': [round(span['duration'] * 1000, 1) for span in spans],
+        'thread': [span['thread'] for span in spans],
+        'details': [", ".join(f"{key}={value}" for key, value in span['attrs'].items()) for span in spans],
+    })
+
+def show_debug_panel(trace, import_times=None):
+    with st.expander("🛠️ Debug: this rerun"):
+        counters = trace.counters
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Rerun so far", f"{trace.duration * 1000:.0f} ms")
+        col2.metric("API calls", counters.get('api_calls', 0))
+        col3.metric("KB received", f"{counters.get('bytes_received', 0) / 1024:.1f}")
+        col4.metric("Rows parsed", counters.get('rows_parsed', 0))
+
+        st.markdown("**Spans**")
+        st.dataframe(_spans_table(trace), use_container_width=True, hide_index=True)
+
+        st.markdown("**Background (sync/prefetch) spans**")
+        st.dataframe(_spans_table(background_trace).tail(50), use_container_width=True, hide_index=True)
+
+        if import_times:
+            st.markdown("**Module imports (first use)**")
+            st.dataframe(pd.DataFrame({
+                'module': list(import_times),
+                'import (ms)': [round(seconds * 1000, 1) for seconds in import_times.values()],
+            }), use_container_width=True, hide_index=True)
+
+        st.markdown("**Caches**")
+        st.json({
+            'datasets': dataset_cache.stats(),
+            'charts': chart_cache.stats(),
+            'sheets_requests': sheets_scheduler.stats(),
+            'worksheets': sheet_registry.stats(),
+            'prefetch': dict(prefetch_status),
+            'sync_errors': dict(sync_errors),
+        })
+
+        col1, col2 = st.columns(2)
+        col1.download_button("⬇️ Chrome trace (JSON)", export_chrome_trace(), file_name="expense_tracker_trace.json",
+                             mime="application/json")
+        col2.download_button("⬇️ Span logs (JSON lines)", export_log_lines(), file_name="expense_tracker_spans.jsonl",
+                             mime="application/x-ndjson")
+        st.caption("Chrome trace covers the last reruns plus background work; open it in chrome://tracing or ui.perfetto.dev.")
@@ -1,47 +1,56 @@
 import streamlit as st
-import pandas as pd
+from utils.filter_index import get_filter_index
+from utils.instrumentation import traced
 
+@traced()
 def display_filtered_data(all_data_dict):
     st.markdown("### 🔍 View Debits by Category")
 
-    # Combine all data to get unique categories
-    full_df = pd.concat(all_data_dict.values(), ignore_index=True)
-    category_list = full_df[full_df['debit'] < 0]['category'].dropna().unique().tolist()
-    category_list.sort()
-
-    selected_category = st.selectbox("Select a Category:", category_list)
+    # Prebuilt (category, year) index: switching filters slices it instead of scanning every year
+    index = get_filter_index(all_data_dict)
+    if not index.categories:
+        st.info("No debit entries available.")
+        return
+
+    selected_categories = st.multiselect("Select Categories:", index.categories, default=index.categories[:1])
+
+    # Untouched ranges are dropped so rows without a parsable date still show up
+    amount_range = date_range = None
+    with st.expander("More filters"):
+        full_amount = (0.0, float(index.rows['debit'].max()))
+        if full_amount[1] > 0:
+            amount_range = st.slider("Amount (₹):", *full_amount, full_amount)
+        dates = index.rows['date'].dropna()
+        if not dates.empty:
+            full_dates = (dates.min().date(), dates.max().date())
+            date_range = st.date_input("Date range:", full_dates)
+        search_text = st.text_input("Details contain:")
+
+    if amount_range == full_amount:
+        amount_range = None
+    if date_range is not None and (len(date_range) != 2 or tuple(date_range) == full_dates):
+        date_range = None
 
     st.markdown("---")
 
-    # Loop over each year in descending order
-    for sheet_name in sorted(all_data_dict.keys(), reverse=True):
-        year = sheet_name.split("-")[-1]
-        df = all_data_dict[sheet_name]
-
-        # Filter only relevant category and debit entries
-        filtered_df = df[(df['debit'] < 0) & (df['category'] == selected_category)].copy()
-        if filtered_df.empty:
-            continue
-
-        # inside for-loop, just before sorting
-        filtered_df['debit'] = filtered_df['debit'].abs()
+    results = index.query(selected_categories, amount_range, date_range, search_text.strip())
 
-        # 🔧 Convert 'date' column to datetime for proper sorting
-        filtered_df['date'] = pd.to_datetime(filtered_df['date'], dayfirst=True, errors='coerce')
-
-        # ✅ Now sort by proper datetime
-        filtered_df = filtered_df.sort_values(by='date', ascending=True)
+    # Loop over each year in descending order
+    for year, filtered_df in results.items():
+        filtered_df = filtered_df.copy()
 
         # ✅ Format date for display
         filtered_df['date'] = filtered_df['date'].dt.strftime('%d-%m-%Y')
-        
+
+        columns = ['date', 'month', 'debit', 'debit_details'] + (['category'] if len(selected_categories) > 1 else [])
         st.markdown(f"#### 📅 Year: {year}")
         st.dataframe(
-            filtered_df[['date', 'month', 'debit', 'debit_details']].rename(columns={
+            filtered_df[columns].rename(columns={
                 'date': 'Date',
                 'month': 'Month',
                 'debit': 'Amount (₹)',
-                'debit_details': 'Details'
+                'debit_details': 'Details',
+                'category': 'Category'
             }),
             use_container_width=True
         )
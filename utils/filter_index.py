@@ -0,0 +1,75 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.dataset_cache import dataset_version
+from utils.instrumentation import span
+
+# 🗂️ Debit rows of every year sorted by (category, year, date), indexed by (category, year) → row slice
+class FilterIndex:
+    def __init__(self, yearly_data):
+        frames = []
+        for sheet_title, df in yearly_data.items():
+            debits = df.loc[df['debit'] < 0, ['date', 'month', 'debit', 'debit_details', 'category']]
+            frames.append(debits.assign(year=sheet_title.split('-')[-1]))
+        columns = ['date', 'month', 'debit', 'debit_details', 'category', 'year']
+        rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+        rows['category'] = rows['category'].astype(str)
+        rows['debit'] = rows['debit'].abs()
+        rows = rows.sort_values(['category', 'year', 'date'], kind='stable').reset_index(drop=True)
+        self.rows = rows
+        self.details = rows['debit_details'].astype(str).str.lower().to_numpy()
+
+        # Group boundaries of the sorted (category, year) keys → {(category, year): (start, stop)}
+        change = (rows['category'].ne(rows['category'].shift()) | rows['year'].ne(rows['year'].shift())).to_numpy()
+        starts = np.flatnonzero(change)
+        stops = np.append(starts[1:], len(rows))
+        self.slices = {
+            (rows['category'].iat[start], rows['year'].iat[start]): (start, stop)
+            for start, stop in zip(starts, stops)
+        }
+        self.categories = sorted({category for category, _ in self.slices})
+        self.years = sorted({year for _, year in self.slices}, reverse=True)
+
+    def positions(self, categories, year):
+        """Row positions for the categories in one year (slices of the sorted rows, no scan)."""
+        ranges = [np.arange(*self.slices[(category, year)]) for category in categories if (category, year) in self.slices]
+        return np.concatenate(ranges) if ranges else np.array([], dtype=int)
+
+    def query(self, categories, amount_range=None, date_range=None, text=None):
+        """Returns {year: matching rows sorted by date}, newest year first."""
+        results = {}
+        for year in self.years:
+            positions = self.positions(categories, year)
+            if positions.size == 0:
+                continue
+            subset = self.rows.iloc[positions]
+            mask = np.ones(len(subset), dtype=bool)
+            if amount_range is not None:
+                mask &= subset['debit'].between(*amount_range).to_numpy()
+            if date_range is not None:
+                start, end = (pd.Timestamp(value) for value in date_range)
+                mask &= subset['date'].between(start, end).to_numpy()
+            if text:
+                mask &= pd.Series(self.details[positions]).str.contains(text.lower(), regex=False).to_numpy()
+            subset = subset[mask]
+            if not subset.empty:
+                results[year] = subset.sort_values('date', kind='stable') if len(categories) > 1 else subset
+        return results
+
+# ♻️ Rebuilt only when the underlying yearly frames change (new dataset version)
+_index_lock = threading.Lock()
+_index = {'key': None, 'value': None}
+
+def get_filter_index(yearly_data):
+    key = dataset_version(yearly_data)
+    with _index_lock:
+        if _index['key'] == key:
+            return _index['value']
+    with span('filter_index.build', sheets=len(yearly_data)):
+        index = FilterIndex(yearly_data)
+    with _index_lock:
+        _index.update(key=key, value=index)
+    return index
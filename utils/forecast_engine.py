@@ -0,0 +1,152 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import span
+
+# 🔮 Month-end and year-end projections per category (pure NumPy, no Streamlit calls).
+# Input is the (day, category) bucket frame of utils.aggregates, turned into one
+# (kind, category, month, day-of-month) cube so every category is projected by the same array operations.
+
+KINDS = ['credit', 'debit']
+DAYS = 31
+CURVE_PRIOR_MONTHS = 3.0  # a category's own day-of-month curve outweighs the pooled one after this many active months
+SEASON_PRIOR_YEARS = 2.0  # a calendar month's own seasonal factor outweighs "no seasonality" after this many years
+BASELINE_MONTHS = 12  # trailing complete months behind each category's (deseasonalized) monthly level
+MIN_PROGRESS = 0.05  # never extrapolate the month's pace from less than 5% of its usual spend
+FORECAST_CACHE_SIZE = 8
+FORECAST_COLUMNS = [
+    f"{kind}_{stat}"
+    for kind in ['credit', 'debit', 'savings']
+    for stat in ['so_far', 'month_end', 'year_to_date', 'year_end']
+]
+
+@dataclass(frozen=True)
+class Forecast:
+    has_data: bool
+    as_of: pd.Timestamp = None
+    month_progress: float = 0.0  # share of a typical month's spend done by `as_of` (all categories)
+    categories: pd.DataFrame = None  # FORECAST_COLUMNS per category, debits as positive amounts
+    totals: pd.Series = None  # FORECAST_COLUMNS summed over every category
+
+def _month_cube(daily, today):
+    """(kind, category, month, day) totals up to `today`; month 0 is the first month with data."""
+    days = pd.DatetimeIndex(daily['day'])
+    keep = np.asarray(days <= today)
+    days = days[keep]
+    codes, categories = pd.factorize(daily['category'].to_numpy()[keep])
+    month_ids = np.asarray(days.year * 12 + days.month - 1)
+    first = int(month_ids.min())
+    n_months = today.year * 12 + today.month - first
+
+    flat = (codes * n_months + month_ids - first) * DAYS + np.asarray(days.day) - 1
+    size = len(categories) * n_months * DAYS
+    values = np.concatenate([
+        daily['credit'].to_numpy(dtype='float64')[keep].clip(min=0),
+        -daily['debit'].to_numpy(dtype='float64')[keep].clip(max=0),
+    ])
+    cube = np.bincount(np.concatenate([flat, flat + size]), weights=values, minlength=2 * size)
+    return cube.reshape(len(KINDS), len(categories), n_months, DAYS), categories, first
+
+def day_of_month_curves(complete):
+    """Typical cumulative share of a month's total by each day, per (kind, category).
+
+    A category's own curve (total-weighted over its complete months) is shrunk toward the
+    curve pooled over every category, so sparse categories borrow the overall shape.
+    """
+    cumulative = complete.cumsum(axis=3)
+    totals = cumulative[..., -1]
+    linear = np.arange(1, DAYS + 1) / DAYS
+    with np.errstate(divide='ignore', invalid='ignore'):
+        own = cumulative.sum(axis=2) / totals.sum(axis=2)[..., None]
+        pooled = cumulative.sum(axis=(1, 2)) / totals.sum(axis=(1, 2))[..., None]
+    pooled = np.where(np.isfinite(pooled), pooled, linear)[:, None, :]
+    active = (totals > 0).sum(axis=2)[..., None]
+    weight = active / (active + CURVE_PRIOR_MONTHS)
+    return np.where(np.isfinite(own), weight * own + (1 - weight) * pooled, pooled), pooled[:, 0, :]
+
+def seasonal_profiles(month_totals, first):
+    """(kind, category, calendar month) factors: a month's average over the overall monthly average,
+    shrunk toward 1 for calendar months seen in few years."""
+    calendar = (first + np.arange(month_totals.shape[2])) % 12
+    one_hot = np.eye(12)[calendar]
+    seen = one_hot.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        raw = (month_totals @ one_hot) / seen / month_totals.mean(axis=2, keepdims=True)
+    weight = seen / (seen + SEASON_PRIOR_YEARS)
+    return np.where(np.isfinite(raw), weight * raw + (1 - weight), 1.0)
+
+def monthly_levels(month_totals, factors, first):
+    """Deseasonalized monthly total per (kind, category) over the trailing BASELINE_MONTHS."""
+    recent = month_totals[..., -BASELINE_MONTHS:]
+    calendar = (first + np.arange(month_totals.shape[2])[-BASELINE_MONTHS:]) % 12
+    if recent.shape[2] == 0:
+        return np.zeros(month_totals.shape[:2])
+    return recent.sum(axis=2) / factors[..., calendar].sum(axis=2)
+
+def compute_forecast(daily, today):
+    today = pd.Timestamp(today).normalize()
+    if daily.empty or not (pd.DatetimeIndex(daily['day']) <= today).any():
+        return Forecast(has_data=False, as_of=today)
+
+    cube, categories, first = _month_cube(daily, today)
+    complete = cube[:, :, :-1, :]
+    curves, pooled = day_of_month_curves(complete)
+    month_totals = complete.sum(axis=3)
+    factors = seasonal_profiles(month_totals, first)
+    levels = monthly_levels(month_totals, factors, first)
+
+    # 📅 This month: what's spent so far, plus the usual remaining share of a blend of
+    # this month's pace and its seasonal expectation (pace counts more as the month goes on)
+    month_over = today.day == today.days_in_month
+    progress = np.ones(levels.shape) if month_over else curves[..., today.day - 1]
+    so_far = cube[:, :, -1, :today.day].sum(axis=2)
+    expected = levels * factors[..., today.month - 1]
+    pace = so_far / np.maximum(progress, MIN_PROGRESS)
+    remaining = (1 - progress) * (progress * pace + (1 - progress) * expected)
+    month_end = so_far + remaining
+
+    # 🗓️ This year: complete months + this month's projection + the seasonal expectation of the months left
+    year_start = max(today.year * 12 - first, 0)
+    year_to_date = month_totals[:, :, year_start:].sum(axis=2) + so_far
+    year_end = year_to_date + remaining + levels * factors[..., today.month:].sum(axis=2)
+
+    stats = {'so_far': so_far, 'month_end': month_end, 'year_to_date': year_to_date, 'year_end': year_end}
+    columns = {f"{kind}_{stat}": values[k] for k, kind in enumerate(KINDS) for stat, values in stats.items()}
+    columns.update({f"savings_{stat}": values[0] - values[1] for stat, values in stats.items()})
+    frame = pd.DataFrame(columns, index=pd.Index(categories, name='category'))[FORECAST_COLUMNS]
+    frame = frame[(frame[['credit_year_end', 'debit_year_end']] != 0).any(axis=1)]
+    return Forecast(
+        has_data=True,
+        as_of=today,
+        month_progress=1.0 if month_over else float(pooled[1, today.day - 1]),
+        categories=frame.sort_values('debit_month_end', ascending=False),
+        totals=frame.sum(),
+    )
+
+# ♻️ Cached per aggregate-store version and day, like the insights results
+_forecasts_lock = threading.Lock()
+_forecasts = OrderedDict()
+
+def get_forecast(store, sheet_titles=None, today=None):
+    """Forecast from the daily buckets of the given sheets (every loaded sheet by default)."""
+    today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+    key = (store.version, None if sheet_titles is None else tuple(sorted(sheet_titles)), today)
+    with _forecasts_lock:
+        if key in _forecasts:
+            _forecasts.move_to_end(key)
+            return _forecasts[key]
+
+    with span('forecast.compute') as attrs:
+        daily = store.daily_frame(sheet_titles)
+        attrs['buckets'] = len(daily)
+        result = compute_forecast(daily, today)
+
+    with _forecasts_lock:
+        _forecasts[key] = result
+        while len(_forecasts) > FORECAST_CACHE_SIZE:
+            _forecasts.popitem(last=False)
+    return result
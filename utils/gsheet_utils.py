@@ -1,7 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import os
+import threading
+import time
 import pandas as pd
 import gspread
+import requests
+from google.auth.exceptions import RefreshError
 from oauth2client.service_account import ServiceAccountCredentials
+from utils.data_utils import parse_dates, to_minor_units, MINOR_UNITS
+from utils.aggregates import aggregate_store, get_aggregates
+from utils.search_index import index_appended_rows
+from utils.instrumentation import span, traced, count, instrument_session
+from utils.dataset_cache import dataset_cache, DATASET_TTL
+from utils.local_sheets import LocalSpreadsheet
+from utils.sheets_scheduler import sheets_scheduler
+from utils.sheet_registry import sheet_registry, MONTHLY_PARTITIONS, is_partition, partition_title
+from utils.snapshot_store import save_snapshot, load_snapshot, mark_full_sync, full_sync_age, list_snapshots, FULL_SYNC_INTERVAL
+from utils.year_archive import save_archive, load_archive, list_archives, remove_archive, is_closed
 
 # 🌐 Constants
 GSHEET_SCOPE = [
@@ -12,52 +28,473 @@ GSHEET_SCOPE = [
 ]
 CREDENTIALS_PATH = "config/birthday.json"
 SPREADSHEET_NAME = "birthday"
+CONNECTION_TTL = 45 * 60  # seconds before the shared client is re-authorized
+SHEETS_BACKEND = os.environ.get("EXPENSE_TRACKER_BACKEND", "gsheets")  # "local" uses LocalSpreadsheet
+SYNC_WORKERS = 2
+PREFETCH_WAIT = 30  # seconds an analytics tab waits on a running prefetch before loading on its own
+OFFLINE_ERRORS = (requests.exceptions.RequestException, gspread.exceptions.APIError, RefreshError, OSError)
+SHEET_COLUMNS = ["date", "month", "credit", "credit_details", "debit", "debit_details", "category"]
+NEW_SHEET_ROWS = 2000  # initial grid of a new yearly sheet
+SHEET_GROW_ROWS = 5000  # the grid is grown in chunks of this many rows...
+SHEET_GROW_HEADROOM = 200  # ...once an append would leave fewer empty rows than this
 
 # ✅ Authentication & client initialization
 def get_gspread_client():
-    creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, GSHEET_SCOPE)
-    return gspread.authorize(creds)
+    with span('sheets.auth'):
+        creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, GSHEET_SCOPE)
+        client = gspread.authorize(creds)
+    instrument_session(client.http_client.session)  # API calls and bytes per rerun
+    return client
 
-# 🧾 Check if current year sheet exists
-def is_new_year_sheet_needed(spreadsheet):
-    current_year = datetime.now().year
-    return f"test-{current_year}" not in [s.title for s in spreadsheet.worksheets()]
+# 🔌 Shared connection (client and spreadsheet handle) reused across reruns and sessions; worksheet
+# handles live in the sheet registry and are dropped with the client they belong to
+_connection_lock = threading.Lock()
+_connection = {'client': None, 'spreadsheet': None, 'created_at': 0.0}
 
-# 🆕 Create sheet for new year with header
+def get_spreadsheet(force_refresh=False):
+    """Returns the cached spreadsheet handle, re-authorizing when forced or older than CONNECTION_TTL."""
+    with _connection_lock:
+        expired = time.monotonic() - _connection['created_at'] > CONNECTION_TTL
+        if force_refresh or expired or _connection['spreadsheet'] is None:
+            with span('sheets.connect', backend=SHEETS_BACKEND):
+                client = None if SHEETS_BACKEND == "local" else get_gspread_client()
+                _connection.update(
+                    client=client,
+                    spreadsheet=LocalSpreadsheet() if client is None else sheets_scheduler.read(('open', SPREADSHEET_NAME), client.open, SPREADSHEET_NAME),
+                    created_at=time.monotonic()
+                )
+                sheet_registry.invalidate()
+        return _connection['spreadsheet']
+
+def reset_connection():
+    with _connection_lock:
+        _connection.update(client=None, spreadsheet=None, created_at=0.0)
+    sheet_registry.invalidate()
+
+def _is_auth_error(error):
+    if isinstance(error, RefreshError):
+        return True
+    return isinstance(error, gspread.exceptions.APIError) and error.response.status_code == 401
+
+def with_reconnect(fn):
+    """Runs fn(spreadsheet), reconnecting once if the cached credentials were rejected."""
+    try:
+        return fn(get_spreadsheet())
+    except (gspread.exceptions.APIError, RefreshError) as e:
+        if not _is_auth_error(e):
+            raise
+        return fn(get_spreadsheet(force_refresh=True))
+
+def get_worksheet(spreadsheet, sheet_title):
+    entry = sheet_registry.get(spreadsheet, sheet_title)
+    if entry is None:
+        raise gspread.exceptions.WorksheetNotFound(sheet_title)
+    return entry['worksheet']
+
+# 🆕 Create sheet for new year (or a monthly partition) with header
 def create_new_year_sheet(spreadsheet, sheet_title):
-    sheet = spreadsheet.add_worksheet(title=sheet_title, rows="1000", cols="26")
-    sheet.append_row(["date", "month", "credit", "credit_details", "debit", "debit_details", "category"])
+    sheet = sheets_scheduler.write(spreadsheet.add_worksheet, title=sheet_title, rows=NEW_SHEET_ROWS, cols=len(SHEET_COLUMNS))
+    sheets_scheduler.write(sheet.append_row, SHEET_COLUMNS)
+    sheet_registry.add(spreadsheet.id, sheet)
     return sheet
 
-# 📥 Load current year's data
+def get_or_create_year_sheet(spreadsheet, sheet_title):
+    try:
+        return get_worksheet(spreadsheet, sheet_title)
+    except gspread.exceptions.WorksheetNotFound:
+        return create_new_year_sheet(spreadsheet, sheet_title)
+
+# 🆔 Spreadsheet id of a worksheet handle (cache key)
+def _spreadsheet_id(sheet):
+    return getattr(sheet, 'spreadsheet_id', None) or sheet.spreadsheet.id
+
+# 🧹 Canonical typed frame built once per load and shared (read-only) by every session and view
+def _to_amount(series):
+    """Parsed through integer paise: int64 rupees when every amount is whole (as the forms write them),
+    otherwise float64 rupees exact to the paisa."""
+    minor = to_minor_units(series)
+    if (minor % MINOR_UNITS == 0).all():
+        return minor // MINOR_UNITS
+    return minor / MINOR_UNITS
+
+def build_canonical_frame(sheet_title, df):
+    """Types a raw worksheet frame: datetime64 dates, numeric amounts, categorical
+    category/month/year columns, Arrow-backed details text and precomputed month/ISO-week keys."""
+    with span('parse.canonical_frame', sheet=sheet_title, rows=len(df)):
+        count('rows_parsed', len(df))
+        return _build_canonical_frame(sheet_title, df)
+
+def _build_canonical_frame(sheet_title, df):
+    df = df.copy()
+    for col in SHEET_COLUMNS:
+        if col not in df:
+            df[col] = 0 if col in ('credit', 'debit') else ''
+
+    df['date'] = parse_dates(df['date'])
+    df['credit'] = _to_amount(df['credit'])
+    df['debit'] = _to_amount(df['debit'])
+    df['credit_details'] = df['credit_details'].astype('str')
+    df['debit_details'] = df['debit_details'].astype('str')
+    df['month'] = df['month'].astype('str').astype('category')
+    df['category'] = df['category'].astype(str).astype('category')
+    df['category_lower'] = df['category'].str.lower().astype('category')
+    df['year'] = pd.Categorical([sheet_title.split('-')[-1]] * len(df))
+
+    iso = df['date'].dt.isocalendar()
+    df['month_year'] = df['date'].dt.to_period('M')
+    df['iso_year'] = iso['year'].astype('UInt16')
+    df['week'] = iso['week'].astype('UInt8')
+    return df
+
+CATEGORICAL_COLUMNS = ['category', 'category_lower', 'month', 'year']
+
+def append_canonical_rows(df, sheet_title, rows):
+    """Returns `df` with new rows (dicts or a frame) appended in canonical form (categoricals kept)."""
+    new_df = build_canonical_frame(sheet_title, pd.DataFrame(rows))
+    if df is None or df.empty:
+        return new_df
+    combined = pd.concat([df, new_df], ignore_index=True)
+    for col in CATEGORICAL_COLUMNS:
+        combined[col] = combined[col].astype('category')
+    return combined
+
+# 💾 Cache + local snapshot writes go together so cold starts see our latest data
+def _store(spreadsheet_id, sheet_title, df, revision=None, appended=None, full_sync=False):
+    """`full_sync` marks `df` as a complete download of the sheet (restarts the FULL_SYNC_INTERVAL clock).
+
+    Returns False when `revision` is outdated: a newer write already landed and `df` was dropped.
+    """
+    if not dataset_cache.put(spreadsheet_id, sheet_title, df, revision):
+        return False
+    if appended is not None:
+        aggregate_store.add_rows(sheet_title, appended, frame=df)
+        index_appended_rows(sheet_title, appended, frame=df)
+    try:
+        save_snapshot(sheet_title, df, SHEET_COLUMNS)
+        if full_sync:
+            mark_full_sync(sheet_title)
+    except OSError:
+        pass  # Read-only disk: keep serving from memory
+    return True
+
+def _load_from_snapshot(sheet_title):
+    raw = load_snapshot(sheet_title)
+    return None if raw is None else build_canonical_frame(sheet_title, raw)
+
+# ⚡ Serve a worksheet without waiting for the network (cache, then snapshot) and revalidate in background
+def _read_local(spreadsheet, sheet_title):
+    df = dataset_cache.get(spreadsheet.id, sheet_title)
+    if df is not None:
+        return df
+    df = dataset_cache.peek(spreadsheet.id, sheet_title)
+    if df is None:
+        df = _load_from_snapshot(sheet_title)
+        if df is not None:
+            dataset_cache.put(spreadsheet.id, sheet_title, df, -1)  # Served, but never counted as fresh
+    if df is not None:
+        schedule_sync(spreadsheet, [sheet_title])
+    return df
+
+# 🔄 Background delta sync: fetch only rows past the local copy (full reload every FULL_SYNC_INTERVAL, which
+# also picks up rows edited or deleted in the sheet)
+_sync_executor = ThreadPoolExecutor(max_workers=SYNC_WORKERS, thread_name_prefix="sheet-sync")
+_sync_lock = threading.Lock()
+_sync_in_flight = set()
+sync_errors = {}
+
+def schedule_sync(spreadsheet, sheet_titles):
+    with _sync_lock:
+        titles = [title for title in sheet_titles if title not in _sync_in_flight]
+        _sync_in_flight.update(titles)
+    if titles:
+        _sync_executor.submit(_sync_worksheets, spreadsheet, titles)
+
+def _known_rows(spreadsheet_id, sheet_title, sources, base):
+    """Rows held locally per source worksheet, or None when unknown (the year is read in full)."""
+    if sources == [sheet_title]:
+        return [len(base)]  # A single worksheet: the local frame is its rows
+    offsets = [(sheet_registry.peek(spreadsheet_id, source) or {}).get('data_rows') for source in sources]
+    return None if None in offsets or sum(offsets) != len(base) else offsets
+
+def _sync_worksheets(spreadsheet, sheet_titles):
+    try:
+        bases, ranges, plans = {}, [], {}
+        revisions = {title: dataset_cache.revision(spreadsheet.id, title) for title in sheet_titles}
+        for title in sheet_titles:
+            base = dataset_cache.peek(spreadsheet.id, title)
+            age = full_sync_age(title)
+            sources = sheet_registry.sources(spreadsheet, title) or [title]
+            offsets = None if base is None else _known_rows(spreadsheet.id, title, sources, base)
+            if offsets is None or age is None or age > FULL_SYNC_INTERVAL:
+                plans[title] = [(source, None) for source in sources]
+                ranges.extend(f"'{source}'" for source in sources)
+            else:
+                bases[title] = base
+                plans[title] = list(zip(sources, offsets))
+                ranges.extend(f"'{source}'!A{offset + 2}:G" for source, offset in plans[title])
+
+        with span('sheets.delta_sync', sheets=len(sheet_titles), full=len(sheet_titles) - len(bases)):
+            response = sheets_scheduler.read((spreadsheet.id, 'batch_get', tuple(ranges)), spreadsheet.values_batch_get, ranges)
+        value_ranges = iter(response.get('valueRanges', []))
+        for title in sheet_titles:
+            parts = [(source, offset, next(value_ranges, {}).get('values', [])) for source, offset in plans[title]]
+            for source, offset, values in parts:
+                data_rows = max(len(values) - 1, 0) if offset is None else offset + len(values)
+                sheet_registry.update(spreadsheet.id, source, data_rows=data_rows)
+            values = [row for _, _, rows in parts for row in rows]
+            if title not in bases:
+                df = build_canonical_frame(title, _values_to_df(_merge_values([rows for _, _, rows in parts])))
+                stored = _store(spreadsheet.id, title, df, revisions[title], full_sync=True)
+            elif values:
+                delta = build_canonical_frame(title, _values_to_df([SHEET_COLUMNS] + values))
+                df = append_canonical_rows(bases[title], title, delta)
+                _store(spreadsheet.id, title, df, revisions[title], appended=delta)
+                continue
+            else:
+                df = bases[title]
+                stored = dataset_cache.put(spreadsheet.id, title, df, revisions[title])  # Nothing new: the snapshot is current
+            if stored:
+                _close_if_finished(spreadsheet.id, title, df, revisions[title])
+            sync_errors.pop(title, None)
+    except Exception as e:
+        for title in sheet_titles:
+            sync_errors[title] = str(e)
+    finally:
+        with _sync_lock:
+            _sync_in_flight.difference_update(sheet_titles)
+
+def current_sheet_title():
+    return f"test-{datetime.now().year}"
+
+# 📥 Load current year's data (cache → local snapshot → Google Sheets)
+@traced()
 def load_data_from_gsheet():
-    client = get_gspread_client()
-    spreadsheet = client.open(SPREADSHEET_NAME)
-    sheet_title = f"test-{datetime.now().year}"
-
-    if is_new_year_sheet_needed(spreadsheet):
-        worksheet = create_new_year_sheet(spreadsheet, sheet_title)
-    else:
-        worksheet = spreadsheet.worksheet(sheet_title)
-
-    df = pd.DataFrame(worksheet.get_all_records())
-    return df, worksheet, spreadsheet
-
-# 🔄 Push updated DataFrame to Google Sheet
-def update_data_to_gsheet(sheet, df):
-    sheet.clear()
-    data = [df.columns.tolist()] + df.values.tolist()
-    sheet.update('A1', data)
-
-# 📊 Load all yearly data from "test-" sheets
-def load_yearly_data(spreadsheet):
-    yearly_data = {}
-    for sheet in spreadsheet.worksheets():
-        if sheet.title.lower().startswith("test-"):
-            df = pd.DataFrame(sheet.get_all_records())
-            if not df.empty:
-                df['year'] = sheet.title.split('-')[-1]
-                df['credit'] = pd.to_numeric(df.get('credit', 0), errors='coerce').fillna(0)
-                df['debit'] = pd.to_numeric(df.get('debit', 0), errors='coerce').fillna(0)
-                yearly_data[sheet.title] = df
-    return yearly_data
+    sheet_title = current_sheet_title()
+
+    def _load(spreadsheet):
+        worksheet = get_or_create_year_sheet(spreadsheet, sheet_title)
+
+        df = _read_local(spreadsheet, sheet_title)
+        if df is None:
+            revision = dataset_cache.revision(spreadsheet.id, sheet_title)
+            df = _fetch_years(spreadsheet, [sheet_title])[sheet_title]
+            _store(spreadsheet.id, sheet_title, df, revision, full_sync=True)
+        return df, worksheet, spreadsheet
+
+    try:
+        return with_reconnect(_load)
+    except OFFLINE_ERRORS:
+        # 📴 Google Sheets unreachable: serve the local snapshot read-only
+        df = _load_from_snapshot(sheet_title)
+        if df is None:
+            raise
+        return df, None, None
+
+# 📏 Grow the grid in large chunks ahead of appends (also keeps delta reads past the last row inside the grid)
+def _ensure_capacity(spreadsheet_id, sheet, incoming):
+    entry = sheet_registry.peek(spreadsheet_id, sheet.title)
+    if entry is None or entry['data_rows'] is None:
+        return  # Fill level unknown until the sheet is read; Sheets still extends the grid on append
+    needed = 1 + entry['data_rows'] + incoming + SHEET_GROW_HEADROOM
+    if needed > entry['row_count']:
+        grow = -(-(needed - entry['row_count']) // SHEET_GROW_ROWS) * SHEET_GROW_ROWS
+        with span('sheets.grow', sheet=sheet.title, rows=grow):
+            sheets_scheduler.write(sheet.add_rows, grow)
+        sheet_registry.update(spreadsheet_id, sheet.title, row_count=entry['row_count'] + grow)
+
+# 🗓️ Rows of a yearly sheet go to its monthly partitions when those are enabled (undated rows stay in the year)
+def _route_rows(sheet, rows):
+    if not MONTHLY_PARTITIONS or is_partition(sheet.title):
+        return [(sheet, rows)]
+    dates = parse_dates(pd.Series([row.get('date', '') for row in rows], dtype=object))
+    groups = {}
+    for row, date in zip(rows, dates):
+        groups.setdefault(sheet.title if pd.isna(date) else partition_title(sheet.title, date), []).append(row)
+    return [
+        (sheet if title == sheet.title else get_or_create_year_sheet(sheet.spreadsheet, title), group)
+        for title, group in groups.items()
+    ]
+
+# ➕ Append only the new rows (one API call per target worksheet for any number of queued entries)
+def append_rows_to_gsheet(sheet, rows):
+    if not rows:
+        return
+    spreadsheet_id = _spreadsheet_id(sheet)
+    for target, target_rows in _route_rows(sheet, rows):
+        values = [[row.get(col, '') for col in SHEET_COLUMNS] for row in target_rows]
+        _ensure_capacity(spreadsheet_id, target, len(values))
+        with span('sheets.append_rows', sheet=target.title, rows=len(values)):
+            sheets_scheduler.write(target.append_rows, values, value_input_option="RAW", table_range="A1")
+        sheet_registry.note_append(spreadsheet_id, target.title, len(values))
+
+    # Keep the cached frame and snapshot of the year in step with the sheet instead of re-downloading it
+    current = dataset_cache.peek(spreadsheet_id, sheet.title)
+    dataset_cache.invalidate(spreadsheet_id, sheet.title)
+    reopen_year(sheet.title)  # After the revision bump, so a concurrent close either sees it or is undone here
+    if current is not None:
+        appended = build_canonical_frame(sheet.title, pd.DataFrame(rows))
+        _store(spreadsheet_id, sheet.title, append_canonical_rows(current, sheet.title, appended), appended=appended)
+
+# 🧱 Convert raw sheet values (header row + rows) into a DataFrame like get_all_records()
+def _values_to_df(values):
+    if not values:
+        return pd.DataFrame()
+    header, rows = values[0], values[1:]
+    width = len(header)
+    rows = [gspread.utils.numericise_all(list(row[:width]) + [''] * (width - len(row))) for row in rows]
+    return pd.DataFrame(rows, columns=header)
+
+def _merge_values(parts):
+    """Values of several worksheets (a year and its monthly partitions) as one header + rows list."""
+    header, rows = None, []
+    for values in parts:
+        if values:
+            header = header or values[0]
+            rows.extend(values[1:])
+    return [header] + rows if header else []
+
+# 📥 Full download of yearly sheets, monthly partitions included, in one batch request
+def _fetch_years(spreadsheet, sheet_titles):
+    sources = {title: sheet_registry.sources(spreadsheet, title) or [title] for title in sheet_titles}
+    ranges = [f"'{source}'" for title in sheet_titles for source in sources[title]]
+    with span('sheets.batch_get', sheets=len(sheet_titles), ranges=len(ranges)):
+        response = sheets_scheduler.read((spreadsheet.id, 'batch_get', tuple(ranges)), spreadsheet.values_batch_get, ranges)
+    value_ranges = iter(response.get('valueRanges', []))
+    frames = {}
+    for title in sheet_titles:
+        parts = [next(value_ranges, {}).get('values', []) for _ in sources[title]]
+        for source, values in zip(sources[title], parts):
+            sheet_registry.update(spreadsheet.id, source, data_rows=max(len(values) - 1, 0))
+        frames[title] = build_canonical_frame(title, _values_to_df(_merge_values(parts)))
+    return frames
+
+# 🧊 Closed years: frozen once from fresh data, then served from their archive (immutable, loaded once)
+_archive_lock = threading.Lock()
+_archive_frames = {}
+
+def _read_archive(sheet_title):
+    with _archive_lock:
+        df = _archive_frames.get(sheet_title)
+    if df is None:
+        archive = load_archive(sheet_title)
+        if archive is None:
+            return None
+        with span('archive.load', sheet=sheet_title, rows=len(archive['rows'])):
+            df = build_canonical_frame(sheet_title, archive['rows'])
+            aggregate_store.load_buckets(sheet_title, archive['buckets'], archive['daily'], frame=df)
+        with _archive_lock:
+            df = _archive_frames.setdefault(sheet_title, df)
+    return df
+
+def close_year(sheet_title, df):
+    """Freezes a finished year's rows and aggregate buckets into its local archive."""
+    aggregate_store.ensure(sheet_title, df)
+    buckets, daily = aggregate_store.export_sheet(sheet_title)
+    with span('archive.close', sheet=sheet_title, rows=len(df)):
+        save_archive(sheet_title, df.reindex(columns=SHEET_COLUMNS), buckets, daily)
+    with _archive_lock:
+        _archive_frames[sheet_title] = df
+
+def reopen_year(sheet_title):
+    """A write to a closed year drops its archive; the year is frozen again from its next fresh read."""
+    with _archive_lock:
+        _archive_frames.pop(sheet_title, None)
+    if sheet_title in list_archives():
+        remove_archive(sheet_title)
+
+def _close_if_finished(spreadsheet_id, sheet_title, df, revision):
+    """Called with freshly downloaded frames only (read at cache `revision`), so an archive never misses late edits."""
+    def superseded():
+        return dataset_cache.revision(spreadsheet_id, sheet_title) != revision  # One of our writes landed since
+
+    if df is None or df.empty or not is_closed(sheet_title) or sheet_title in list_archives() or superseded():
+        return
+    try:
+        close_year(sheet_title, df)
+    except OSError:
+        return  # Read-only disk: keep reading the year from Sheets
+    if superseded():
+        reopen_year(sheet_title)
+
+# 📊 Load all yearly data from "test-" sheets (archives for closed years, one batch request for the rest)
+@traced()
+def load_yearly_data(spreadsheet, on_progress=None):
+    archived = set(list_archives())
+    if spreadsheet is None:
+        # 📴 Offline: every archive and yearly snapshot on disk
+        titles = sorted(archived | set(list_snapshots()))
+        local = {title: _read_archive(title) if title in archived else _load_from_snapshot(title) for title in titles}
+        return {title: df for title, df in local.items() if df is not None and not df.empty}
+
+    titles = sheet_registry.yearly_titles(spreadsheet)
+    local = {}
+    for title in titles:
+        local[title] = _read_archive(title) if title in archived else None
+        if local[title] is None:
+            local[title] = _read_local(spreadsheet, title)
+        if on_progress is not None and local[title] is not None:
+            on_progress(sum(df is not None for df in local.values()), len(titles))
+    missing = [title for title, df in local.items() if df is None]
+
+    if missing:
+        revisions = {title: dataset_cache.revision(spreadsheet.id, title) for title in missing}
+        for title, df in _fetch_years(spreadsheet, missing).items():
+            if _store(spreadsheet.id, title, df, revisions[title], full_sync=True):
+                _close_if_finished(spreadsheet.id, title, df, revisions[title])
+                local[title] = df
+            else:
+                local[title] = dataset_cache.peek(spreadsheet.id, title)  # The newer frame our write stored
+        if on_progress is not None:
+            on_progress(len(titles), len(titles))
+
+    return {title: df for title, df in local.items() if df is not None and not df.empty}
+
+# 🚚 Background prefetch: warm every yearly sheet (and its aggregates) right after login
+_prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheet-prefetch")
+_prefetch_lock = threading.Lock()
+_prefetch = {'future': None, 'spreadsheet_id': None, 'data': None}
+prefetch_status = {'state': 'idle', 'loaded': 0, 'total': 0, 'error': None, 'finished_at': 0.0}
+
+def _run_prefetch(spreadsheet):
+    def _progress(loaded, total):
+        prefetch_status.update(loaded=loaded, total=total)
+
+    try:
+        yearly_data = load_yearly_data(spreadsheet, on_progress=_progress)
+        get_aggregates(yearly_data)
+        _prefetch['data'] = yearly_data
+        prefetch_status.update(state='done', error=None)
+    except Exception as e:
+        prefetch_status.update(state='failed', error=str(e))
+    finally:
+        prefetch_status['finished_at'] = time.time()
+
+def start_prefetch(spreadsheet):
+    """Starts loading the yearly sheets in the background; a no-op while one is running or still fresh."""
+    if spreadsheet is None:
+        return
+    with _prefetch_lock:
+        future = _prefetch['future']
+        if future is not None and _prefetch['spreadsheet_id'] == spreadsheet.id:
+            if not future.done():
+                return
+            fresh = time.time() - prefetch_status['finished_at'] < DATASET_TTL
+            if prefetch_status['state'] == 'done' and fresh:
+                return
+        prefetch_status.update(state='running', loaded=0, total=0, error=None)
+        _prefetch['spreadsheet_id'] = spreadsheet.id
+        _prefetch['future'] = _prefetch_executor.submit(_run_prefetch, spreadsheet)
+
+def prefetched_yearly_data():
+    """The last prefetched yearly frames, or None while nothing has finished loading (never waits)."""
+    return _prefetch['data']
+
+def get_yearly_data(spreadsheet):
+    """load_yearly_data, joining a running prefetch first instead of fetching the same sheets twice."""
+    future = _prefetch['future']
+    if spreadsheet is not None and future is not None and _prefetch['spreadsheet_id'] == spreadsheet.id:
+        try:
+            future.result(timeout=PREFETCH_WAIT)
+        except Exception:
+            pass  # Timed out or failed: load directly below
+    return load_yearly_data(spreadsheet)
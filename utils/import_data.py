@@ -0,0 +1,57 @@
+import time
+import streamlit as st
+import pandas as pd
+from utils.statement_import import import_statement, iter_statement_chunks, map_columns
+from utils.instrumentation import traced
+
+@traced()
+def show_import(spreadsheet, yearly_data):
+    st.markdown("### 📥 Import Statement")
+
+    if spreadsheet is None:
+        st.warning("Offline: statements can be imported once Google Sheets is reachable.")
+        return
+
+    uploaded = st.file_uploader("Bank / UPI statement (CSV or XLSX):", type=['csv', 'xlsx'])
+    if uploaded is None:
+        st.caption("Columns are matched by name (Date, Narration/Description, Withdrawal/Debit, Deposit/Credit or a signed Amount). "
+                   "Rows already in your sheets are skipped.")
+        return
+
+    # Column mapping from the first rows only
+    preview = next(iter_statement_chunks(uploaded, uploaded.name, chunk_rows=5), pd.DataFrame())
+    mapping = map_columns(preview.columns)
+    st.dataframe(preview, use_container_width=True, hide_index=True)
+    st.caption("Detected columns: " + (", ".join(f"{source} → {target}" for source, target in mapping.items()) or "none"))
+
+    dry_run = st.checkbox("Preview only (don't write to the sheets)", value=True)
+    if not st.button("Import"):
+        return
+
+    uploaded.seek(0)
+    status = st.empty()
+
+    def _progress(result):
+        status.caption(f"⏳ {result.rows_read} rows read, {result.imported} queued, {result.duplicates} duplicates…")
+
+    start = time.perf_counter()
+    try:
+        result = import_statement(spreadsheet, uploaded, uploaded.name, yearly_data, dry_run=dry_run, on_progress=_progress)
+    except ValueError as e:
+        status.empty()
+        st.error(f"Could not import {uploaded.name}: {e}")
+        return
+    status.empty()
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("New rows", result.imported)
+    col2.metric("Duplicates skipped", result.duplicates)
+    col3.metric("Unusable rows", result.skipped)
+    for sheet_title, count in sorted(result.years.items()):
+        st.markdown(f"• **{sheet_title}**: {count} rows")
+
+    elapsed = time.perf_counter() - start
+    if dry_run:
+        st.info(f"Preview of {result.rows_read} rows in {elapsed:.1f}s. Untick \"Preview only\" to write them.")
+    else:
+        st.success(f"Imported {result.imported} of {result.rows_read} rows in {elapsed:.1f}s.")
@@ -0,0 +1,181 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+
+import pandas as pd
+
+from utils.instrumentation import span
+
+# 🧠 Pure scoring/personality engine for the AI Insights page (no Streamlit calls).
+# Input is an aggregate bucket frame (category, category_lower, credit, debit, rows) from utils.aggregates.
+
+FIXED_CATEGORIES = ['sip', 'rent,maid & electricity bills', 'financial support to family']
+ESSENTIAL_CATEGORIES = ['Veggies,Gas cylinder and Dmart', 'Petrol', 'Recharge']
+LIFESTYLE_CATEGORIES = ['Shopping', 'Self Care', 'Trips', 'Weekend expense', 'Travelling expense', 'Pune & village expense']
+WINDOWS = {"All time": None, "Last 30 days": 30, "Last 90 days": 90, "Last 365 days": 365}
+RESULT_CACHE_SIZE = 16
+
+@dataclass(frozen=True)
+class HealthScore:
+    total_income: float
+    total_expenses: float
+    savings_rate: float
+    sip_amount: float
+    sip_ratio: float
+    discretionary_ratio: float
+    score: float
+    tier: str  # champion | achiever | balancer | attention | emergency
+
+@dataclass(frozen=True)
+class SpendingProfile:
+    category_percentages: pd.Series
+    spontaneous_pct: float
+    planned_pct: float
+    personality: str  # spontaneous | planned | balanced
+    top_category: str
+    top_percentage: float
+    essential_pct: float
+    lifestyle_pct: float
+    balance: str  # practical | lifestyle | balanced
+    transaction_count: int
+    avg_transaction: float
+    behavior: str  # frequent_small | bulk | moderate
+    focus: str  # concentrated | distributed | opportunity
+
+@dataclass(frozen=True)
+class InsightResult:
+    has_data: bool
+    health: HealthScore = None  # None when there is no income to score against
+    profile: SpendingProfile = None  # None when there are no discretionary expenses
+
+def _health_tier(score):
+    if score >= 85:
+        return 'champion'
+    if score >= 75:
+        return 'achiever'
+    if score >= 60:
+        return 'balancer'
+    if score >= 40:
+        return 'attention'
+    return 'emergency'
+
+def score_health(buckets):
+    total_income = buckets['credit'].sum()
+    total_expenses = abs(buckets['debit'].sum())
+    if total_income <= 0:
+        return None
+
+    # Base score from savings rate (50% savings = 100 score)
+    savings_rate = (total_income - total_expenses) / total_income * 100
+    base_score = max(0, min(100, savings_rate * 2))
+
+    debit_by_category = buckets.groupby('category_lower')['debit'].sum().abs()
+    fixed_expenses = debit_by_category.reindex(FIXED_CATEGORIES, fill_value=0).sum()
+    discretionary_expenses = total_expenses - fixed_expenses
+
+    # SIP Investment Bonus (up to +15 points for 10%+ SIP)
+    adjustments = 0
+    sip_amount = debit_by_category.get('sip', 0)
+    sip_ratio = sip_amount / total_income * 100
+    if sip_amount > 0:
+        adjustments += min(15, sip_ratio * 1.5)
+
+    # Discretionary spending penalty/bonus
+    discretionary_ratio = discretionary_expenses / total_income * 100
+    if discretionary_ratio > 60:
+        adjustments -= 10
+    elif discretionary_ratio < 30:
+        adjustments += 10
+
+    score = max(0, min(100, base_score + adjustments))
+    return HealthScore(
+        total_income=total_income, total_expenses=total_expenses, savings_rate=savings_rate,
+        sip_amount=sip_amount, sip_ratio=sip_ratio, discretionary_ratio=discretionary_ratio,
+        score=score, tier=_health_tier(score)
+    )
+
+def build_profile(buckets):
+    expense = buckets[~buckets['category_lower'].isin(FIXED_CATEGORIES)]
+    if expense.empty:
+        return None
+
+    category_totals = expense.groupby('category')['debit'].sum().abs()
+    category_percentages = (category_totals / category_totals.sum() * 100).round(1)
+
+    def pct(*names):
+        return sum(category_percentages.get(name, 0) for name in names)
+
+    spontaneous_pct = pct("Today's expense ", 'Weekend expense')
+    planned_pct = pct('Shopping', 'Trips', 'Travelling expense')
+    if spontaneous_pct > 50:
+        personality = 'spontaneous'
+    elif planned_pct > 40:
+        personality = 'planned'
+    else:
+        personality = 'balanced'
+
+    essential_pct = pct(*ESSENTIAL_CATEGORIES)
+    lifestyle_pct = pct(*LIFESTYLE_CATEGORIES)
+    if essential_pct > lifestyle_pct:
+        balance = 'practical'
+    elif lifestyle_pct > essential_pct * 1.5:
+        balance = 'lifestyle'
+    else:
+        balance = 'balanced'
+
+    transaction_count = int(expense['rows'].sum())
+    avg_transaction = abs(expense['debit'].sum()) / transaction_count
+    if avg_transaction < 200 and transaction_count > 20:
+        behavior = 'frequent_small'
+    elif avg_transaction > 1000 and transaction_count < 15:
+        behavior = 'bulk'
+    else:
+        behavior = 'moderate'
+
+    top_category = category_percentages.idxmax() if category_percentages.notna().any() else None
+    top_percentage = category_percentages.max() if top_category is not None else 0
+    if top_percentage > 40:
+        focus = 'concentrated'
+    elif top_percentage < 15:
+        focus = 'distributed'
+    else:
+        focus = 'opportunity'
+
+    return SpendingProfile(
+        category_percentages=category_percentages, spontaneous_pct=spontaneous_pct, planned_pct=planned_pct,
+        personality=personality, top_category=top_category, top_percentage=top_percentage,
+        essential_pct=essential_pct, lifestyle_pct=lifestyle_pct, balance=balance,
+        transaction_count=transaction_count, avg_transaction=avg_transaction, behavior=behavior, focus=focus
+    )
+
+def compute_insights(buckets):
+    if buckets.empty:
+        return InsightResult(has_data=False)
+    return InsightResult(has_data=True, health=score_health(buckets), profile=build_profile(buckets))
+
+# ♻️ Results are cached per aggregate-store version, so they refresh as soon as a transaction lands
+_results_lock = threading.Lock()
+_results = OrderedDict()
+
+def get_insights(store, sheet_titles, window_days=None, today=None):
+    """Insights for the given sheets, over all time or the last `window_days` days."""
+    today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+    key = (store.version, tuple(sorted(sheet_titles)), window_days, today if window_days else None)
+    with _results_lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key]
+
+    with span('insights.compute', window_days=window_days) as attrs:
+        if window_days is None:
+            buckets = store.frame(sheet_titles)
+        else:
+            buckets = store.window_frame(window_days, today, sheet_titles)
+        attrs['buckets'] = len(buckets)
+        result = compute_insights(buckets)
+
+    with _results_lock:
+        _results[key] = result
+        while len(_results) > RESULT_CACHE_SIZE:
+            _results.popitem(last=False)
+    return result
@@ -0,0 +1,177 @@
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+# 🔬 Per-rerun spans and counters (API calls, bytes, rows) for the admin debug panel
+TRACING_ENABLED = os.environ.get("EXPENSE_TRACKER_TRACE", "1") != "0"
+RECENT_TRACES = 20  # finished reruns kept for export
+MAX_BACKGROUND_SPANS = 500  # spans from sync/prefetch threads, which belong to no rerun
+
+logger = logging.getLogger("expense_tracker.trace")
+_EPOCH = time.perf_counter()
+
+class Trace:
+    """Spans and counters recorded while one rerun (or the background workers) ran."""
+
+    def __init__(self, label, max_spans=None):
+        self.label = label
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.end = None
+        self.spans = deque(maxlen=max_spans)
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, name, start, end, attrs):
+        with self._lock:
+            self.spans.append({
+                'name': name,
+                'start': start,
+                'duration': end - start,
+                'thread': threading.current_thread().name,
+                'thread_id': threading.get_ident(),
+                'attrs': attrs,
+            })
+
+    def count(self, counter, value=1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+    def summary(self):
+        return {
+            'label': self.label,
+            'started_at': self.started_at.isoformat(timespec='milliseconds'),
+            'duration_ms': round(self.duration * 1000, 2),
+            'spans': len(self.spans),
+            **self.counters,
+        }
+
+    def log_records(self):
+        """One structured record per span (JSON-serializable)."""
+        with self._lock:
+            spans = list(self.spans)
+        return [{
+            'rerun': self.label,
+            'rerun_started_at': self.started_at.isoformat(timespec='milliseconds'),
+            'span': span['name'],
+            'offset_ms': round((span['start'] - self.start) * 1000, 3),
+            'duration_ms': round(span['duration'] * 1000, 3),
+            'thread': span['thread'],
+            **span['attrs'],
+        } for span in spans]
+
+    def chrome_events(self, pid=1):
+        """Complete ("X") events in the Chrome trace-event format (chrome://tracing, Perfetto)."""
+        with self._lock:
+            spans = list(self.spans)
+        return [{
+            'name': span['name'],
+            'cat': self.label,
+            'ph': 'X',
+            'ts': round((span['start'] - _EPOCH) * 1e6, 1),
+            'dur': round(span['duration'] * 1e6, 1),
+            'pid': pid,
+            'tid': span['thread_id'],
+            'args': span['attrs'],
+        } for span in spans]
+
+_local = threading.local()
+_traces_lock = threading.Lock()
+recent_traces = deque(maxlen=RECENT_TRACES)
+background_trace = Trace("background", max_spans=MAX_BACKGROUND_SPANS)
+
+def current_trace():
+    """The rerun being recorded on this thread, else the shared background trace."""
+    return getattr(_local, 'trace', None) or background_trace
+
+def begin_rerun(label):
+    trace = Trace(label)
+    _local.trace = trace
+    return trace
+
+def end_rerun():
+    trace = getattr(_local, 'trace', None)
+    if trace is None:
+        return None
+    trace.end = time.perf_counter()
+    _local.trace = None
+    with _traces_lock:
+        recent_traces.append(trace)
+    logger.debug(json.dumps(trace.summary(), default=str))
+    return trace
+
+@contextmanager
+def span(name, **attrs):
+    """Times the block; add fields (e.g. rows) to the yielded dict while inside."""
+    if not TRACING_ENABLED:
+        yield attrs
+        return
+    start = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        current_trace().add_span(name, start, time.perf_counter(), attrs)
+
+def traced(name=None):
+    """Decorator form of span()."""
+    def decorator(fn):
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def count(counter, value=1):
+    if TRACING_ENABLED:
+        current_trace().count(counter, value)
+
+# 🌐 HTTP accounting through a requests response hook (every Sheets/Drive call of the gspread client)
+def _record_response(response, *args, **kwargs):
+    if not TRACING_ENABLED:
+        return
+    end = time.perf_counter()
+    request = response.request
+    body = request.body or b''
+    sent = len(body) if isinstance(body, (bytes, str)) else 0
+    received = len(response.content or b'')
+    trace = current_trace()
+    trace.count('api_calls')
+    trace.count('bytes_sent', sent)
+    trace.count('bytes_received', received)
+    path = request.path_url.split('?', 1)[0]
+    trace.add_span(f"http {request.method} {path}", end - response.elapsed.total_seconds(), end,
+                   {'status': response.status_code, 'bytes_sent': sent, 'bytes_received': received})
+
+def instrument_session(session):
+    hooks = session.hooks.setdefault('response', [])
+    if _record_response not in hooks:
+        hooks.append(_record_response)
+    return session
+
+# 📤 Export
+def _all_traces(include_background=True):
+    with _traces_lock:
+        traces = list(recent_traces)
+    return traces + [background_trace] if include_background else traces
+
+def export_chrome_trace(traces=None):
+    traces = _all_traces() if traces is None else traces
+    events = [event for trace in traces for event in trace.chrome_events()]
+    return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}, default=str)
+
+def export_log_lines(traces=None):
+    traces = _all_traces() if traces is None else traces
+    return "\n".join(json.dumps(record, default=str) for trace in traces for record in trace.log_records())
@@ -0,0 +1,167 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+
+import gspread
+import requests
+
+# 📁 File-backed stand-in for a gspread Spreadsheet (offline use and tests)
+LOCAL_SHEETS_PATH = os.environ.get("EXPENSE_TRACKER_LOCAL_SHEETS", "data/local_sheets.json")
+# Simulated network behaviour, to exercise retries/backoff without Google Sheets
+LOCAL_LATENCY = float(os.environ.get("EXPENSE_TRACKER_LOCAL_LATENCY", 0))  # seconds per call
+LOCAL_ERROR_RATE = float(os.environ.get("EXPENSE_TRACKER_LOCAL_ERROR_RATE", 0))  # share of calls failing with 429
+
+_RANGE_RE = re.compile(r"^'?(?P<title>.+?)'?(?:!(?P<start>[A-Z]*)(?P<start_row>\d*)(?::(?P<end>[A-Z]*)(?P<end_row>\d*))?)?$")
+
+def _parse_range(value_range):
+    """Splits "'title'!A5:G" into (title, first row index, last row index or None)."""
+    match = _RANGE_RE.match(value_range)
+    if match is None:
+        raise ValueError(f"Unsupported range: {value_range}")
+    start = int(match['start_row']) - 1 if match['start_row'] else 0
+    end = int(match['end_row']) if match['end_row'] else None
+    return match['title'], start, end
+
+def _quota_error(status=429):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps({'error': {
+        'code': status, 'message': "Quota exceeded (simulated)", 'status': 'RESOURCE_EXHAUSTED'
+    }}).encode()
+    return gspread.exceptions.APIError(response)
+
+class LocalWorksheet:
+    def __init__(self, spreadsheet, title):
+        self.spreadsheet = spreadsheet
+        self.spreadsheet_id = spreadsheet.id
+        self.title = title
+
+    @property
+    def id(self):
+        return self.spreadsheet._ids[self.title]
+
+    @property
+    def _values(self):
+        return self.spreadsheet._data[self.title]
+
+    @property
+    def row_count(self):
+        return max(len(self._values), self.spreadsheet._row_counts.get(self.title, 0))
+
+    def get_all_values(self):
+        self.spreadsheet._simulate_request()
+        return [list(row) for row in self._values]
+
+    def get_all_records(self):
+        values = self.get_all_values()
+        if not values:
+            return []
+        header = values[0]
+        return [
+            dict(zip(header, gspread.utils.numericise_all(row + [''] * (len(header) - len(row)))))
+            for row in values[1:]
+        ]
+
+    def get(self, value_range):
+        _, start, end = _parse_range(f"'{self.title}'!{value_range}")
+        self.spreadsheet._simulate_request()
+        return [list(row) for row in self._values[start:end]]
+
+    def append_row(self, values, **kwargs):
+        self.append_rows([values], **kwargs)
+
+    def append_rows(self, values, **kwargs):
+        self.spreadsheet._simulate_request()
+        with self.spreadsheet._lock:
+            self._values.extend([list(row) for row in values])
+            self.spreadsheet._save()
+
+    def update(self, range_name, values=None, **kwargs):
+        if values is None:
+            range_name, values = 'A1', range_name
+        _, start, _ = _parse_range(f"'{self.title}'!{range_name}")
+        self.spreadsheet._simulate_request()
+        with self.spreadsheet._lock:
+            rows = self._values
+            rows.extend([] for _ in range(start + len(values) - len(rows)))
+            for offset, row in enumerate(values):
+                rows[start + offset] = list(row)
+            self.spreadsheet._save()
+
+    def clear(self):
+        self.spreadsheet._simulate_request()
+        with self.spreadsheet._lock:
+            self._values.clear()
+            self.spreadsheet._save()
+
+    def add_rows(self, rows):
+        self.spreadsheet._simulate_request()
+        with self.spreadsheet._lock:
+            self.spreadsheet._row_counts[self.title] = self.row_count + int(rows)
+
+class LocalSpreadsheet:
+    """Implements the subset of the gspread Spreadsheet API used by gsheet_utils, stored in one JSON file."""
+
+    def __init__(self, path=LOCAL_SHEETS_PATH, title="local", latency=LOCAL_LATENCY, error_rate=LOCAL_ERROR_RATE):
+        self.path = path
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.id = f"local:{os.path.abspath(path)}"
+        self.title = title
+        self._lock = threading.RLock()
+        self._row_counts = {}
+        self._data = {}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self._data = json.load(f)
+        self._ids = {title: i for i, title in enumerate(self._data)}
+
+    def _simulate_request(self):
+        """Counts the call and applies the configured latency / simulated 429s."""
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            raise _quota_error()
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._data, f, default=str)
+        os.replace(tmp_path, self.path)
+
+    def worksheets(self):
+        self._simulate_request()
+        return [LocalWorksheet(self, title) for title in self._data]
+
+    def worksheet(self, title):
+        self._simulate_request()
+        if title not in self._data:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return LocalWorksheet(self, title)
+
+    def add_worksheet(self, title, rows=1000, cols=26, **kwargs):
+        self._simulate_request()
+        with self._lock:
+            self._data[title] = []
+            self._ids[title] = len(self._ids)
+            self._row_counts[title] = int(rows)
+            self._save()
+        return LocalWorksheet(self, title)
+
+    def values_batch_get(self, ranges, params=None):
+        self._simulate_request()
+        value_ranges = []
+        for value_range in ranges:
+            title, start, end = _parse_range(value_range)
+            rows = self._data.get(title, [])[start:end]
+            value_ranges.append({'range': value_range, 'values': [list(row) for row in rows]})
+        return {'spreadsheetId': self.id, 'valueRanges': value_ranges}
@@ -1,24 +1,34 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
+import pandas as pd
+from utils.data_utils import summarize_periods
+from utils.chart_cache import cached_chart
+from utils.forecast_engine import get_forecast
+from utils.instrumentation import traced
 
 def prepare_data(data):
-    data = data[data['category'].str.lower() != 'sip'].copy()
-    data['date'] = pd.to_datetime(data['date'], dayfirst=True)
+    data = data[data['category_lower'] != 'sip'].copy()
     data['display_date'] = data['date'].dt.date
-    data['month_year'] = data['date'].dt.to_period('M')
     return data
 
+def get_summary_source(data, aggregates=None):
+    """Month buckets from the shared aggregate store covering `data`'s months (raw rows without a store).
+
+    The oldest month can be cut partway by the date window, so its totals come from `data`'s own rows.
+    """
+    if aggregates is None or data.empty:
+        return data
+    first, last = data['month_year'].min(), data['month_year'].max()
+    buckets = aggregates.frame()
+    buckets = buckets[
+        (buckets['category_lower'] != 'sip')
+        & (buckets['month_year'] > first) & (buckets['month_year'] <= last)
+    ]
+    columns = ['month_year', 'credit', 'debit']
+    return pd.concat([data.loc[data['month_year'] == first, columns], buckets[columns]], ignore_index=True)
+
 def get_monthly_summary(data):
-    summary = data.groupby('month_year').agg({
-        'debit': lambda x: x[x < 0].sum(),
-        'credit': lambda x: x[x > 0].sum()
-    }).reset_index()
-    summary['debit'] = summary['debit'].abs()
-    summary['savings'] = summary['credit'] - summary['debit']
-    summary['Spend change(%)'] = summary['debit'].pct_change().fillna(0) * 100
-    summary['Income change(%)'] = summary['credit'].pct_change().fillna(0) * 100
-    summary['Savings change(%)'] = summary['savings'].pct_change().fillna(0) * 100
+    summary = summarize_periods(data, 'month')
     summary['month'] = summary['month_year'].astype(str)
     return summary
 
@@ -55,7 +65,6 @@ def get_avg_daily_spend(data):
     monthly = (
         data[data['debit'] < 0]
         .copy()
-        .assign(month_year=lambda df: df['date'].dt.to_period('M'))
         .groupby('month_year')['debit']
         .sum()
         .abs()
@@ -66,12 +75,38 @@ def get_avg_daily_spend(data):
     monthly['month'] = monthly['month_year'].astype(str)
     return monthly
 
-def generate_monthly_insights(data):
+def show_month_end_forecast(forecast, top=8):
+    if not forecast.has_data:
+        st.info("Not enough history to forecast this month yet.")
+        return
+
+    # SIP is left out, as in every other chart on this page
+    categories = forecast.categories[forecast.categories.index.str.lower() != 'sip']
+    totals = categories.sum()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Projected spend", f"₹{totals['debit_month_end']:,.0f}", f"₹{totals['debit_so_far']:,.0f} so far", delta_color="off")
+    col2.metric("Projected income", f"₹{totals['credit_month_end']:,.0f}", f"₹{totals['credit_so_far']:,.0f} so far", delta_color="off")
+    col3.metric("Projected savings", f"₹{totals['savings_month_end']:,.0f}")
+    st.caption(f"By {forecast.as_of:%d %b} about {forecast.month_progress:.0%} of a month's spending is usually done.")
+
+    spending = categories[categories['debit_month_end'] > 0].head(top)
+    st.dataframe(
+        spending[['debit_so_far', 'debit_month_end']].reset_index()
+        .rename(columns={'category': 'Category', 'debit_so_far': 'Spent so far', 'debit_month_end': 'Projected month-end'})
+        .style.format({'Spent so far': '₹{:.0f}', 'Projected month-end': '₹{:.0f}'}),
+        use_container_width=True, hide_index=True
+    )
+
+@traced()
+def generate_monthly_insights(data, aggregates=None):
     st.markdown("## ⚖️ Monthly Spending vs Income")
     data = prepare_data(data)
-    summary = get_monthly_summary(data)
+    if data.empty:
+        st.info("No transactions in the last 350 days yet.")
+        return
+    summary = get_monthly_summary(get_summary_source(data, aggregates))
 
-    st.altair_chart(plot_bar_chart(summary), use_container_width=True)
+    st.altair_chart(cached_chart('monthly_bar', plot_bar_chart, summary), use_container_width=True)
 
     st.dataframe(summary.style.format({
         'debit': '₹{:.0f}',
@@ -83,7 +118,7 @@ def generate_monthly_insights(data):
     }), use_container_width=True)
 
     st.markdown("## 🐖 Monthly Savings Trend")
-    st.altair_chart(plot_line_chart(summary, 'savings'), use_container_width=True)
+    st.altair_chart(cached_chart('monthly_savings', plot_line_chart, summary, 'savings'), use_container_width=True)
 
     st.markdown("## 💸 Biggest Expense per Month")
     max_txn = get_max_expenses(data)
@@ -97,7 +132,10 @@ def generate_monthly_insights(data):
 
     st.markdown("## 📊 Average Daily Spend per Month")
     avg_spend = get_avg_daily_spend(data)
-    st.altair_chart(plot_line_chart(avg_spend, 'avg_daily_spend', color='orange'), use_container_width=True)
+    st.altair_chart(
+        cached_chart('monthly_avg_spend', plot_line_chart, avg_spend, 'avg_daily_spend', 'orange'),
+        use_container_width=True
+    )
 
     st.dataframe(
         avg_spend[['month_year', 'avg_daily_spend']]
@@ -105,3 +143,7 @@ def generate_monthly_insights(data):
         .style.format({'Average Daily Spend': '₹{:.0f}'}),
         use_container_width=True
     )
+
+    if aggregates is not None:
+        st.markdown("## 🔮 Month-End Forecast")
+        show_month_end_forecast(get_forecast(aggregates))
@@ -0,0 +1,36 @@
+import time
+import streamlit as st
+from utils.search_index import get_search_index
+from utils.instrumentation import traced
+
+@traced()
+def show_search(yearly_data):
+    st.markdown("### 🔎 Search Transactions")
+
+    query = st.text_input("Search details & categories:", placeholder="e.g. dmart, petrol jan, trip")
+    if not query.strip():
+        st.caption("Type one or more words; partial words match too (\"dma\" finds \"Dmart\").")
+        return
+
+    start = time.perf_counter()
+    results = get_search_index(yearly_data).search(query, limit=100)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    st.caption(f"{len(results)} result(s) in {elapsed_ms:.1f} ms")
+    if results.empty:
+        st.info("No matching transactions.")
+        return
+
+    results['date'] = results['date'].dt.strftime('%d-%m-%Y')
+    results['year'] = results['sheet'].str.split('-').str[-1]
+    st.dataframe(
+        results[['date', 'year', 'amount', 'details', 'category']].rename(columns={
+            'date': 'Date',
+            'year': 'Year',
+            'amount': 'Amount (₹)',
+            'details': 'Details',
+            'category': 'Category'
+        }).style.map(lambda val: f"color: {'green' if val >= 0 else 'red'}", subset=['Amount (₹)']),
+        use_container_width=True,
+        hide_index=True
+    )
@@ -0,0 +1,126 @@
+from bisect import bisect_left, insort
+import math
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.dataset_cache import frame_version
+from utils.instrumentation import span
+
+# 🔎 Inverted token index over transaction details + category, for the Search page
+TOKEN_PATTERN = r"[a-z0-9]+"
+_TOKEN_RE = re.compile(TOKEN_PATTERN)
+PREFIX_WEIGHT = 0.8  # a prefix hit ("dma" → "dmart") scores a bit lower than an exact token
+RESULT_COLUMNS = ['sheet', 'date', 'amount', 'details', 'category']
+
+def tokenize(text):
+    return _TOKEN_RE.findall(str(text).lower())
+
+class SearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}  # token -> {doc id: term frequency}
+        self._vocab = []  # sorted tokens, for prefix lookups
+        self._docs = {column: [] for column in RESULT_COLUMNS}
+        self._sources = {}
+
+    def __len__(self):
+        return len(self._docs['sheet'])
+
+    def add_frame(self, sheet_title, df, frame=None):
+        """Indexes canonical rows (tokenized in one vectorized pass) and records `frame` as the sheet's source."""
+        if df is None or df.empty:
+            return
+        is_credit = (df['credit'] > 0).to_numpy()
+        details = pd.Series(np.where(is_credit, df['credit_details'], df['debit_details']), index=df.index).astype(str)
+        details = details.where(details != 'NA', '')
+        text = (details + ' ' + df['category'].astype(str)).str.lower()
+        tokens = text.str.findall(TOKEN_PATTERN).explode().dropna()
+
+        with self._lock:
+            base = len(self)
+            positions = df.index.get_indexer(tokens.index)
+            pairs = pd.DataFrame({'doc': positions + base, 'token': tokens.to_numpy()}).value_counts()
+            for (doc, token), tf in pairs.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    insort(self._vocab, token)
+                postings[int(doc)] = int(tf)
+
+            self._docs['sheet'].extend([sheet_title] * len(df))
+            self._docs['date'].extend(df['date'].tolist())
+            self._docs['amount'].extend(np.where(is_credit, df['credit'], df['debit']).tolist())
+            self._docs['details'].extend(details.tolist())
+            self._docs['category'].extend(df['category'].astype(str).tolist())
+            if frame is not None:
+                self._sources[sheet_title] = frame_version(frame)
+
+    def covers(self, yearly_data):
+        """True when the index was built from exactly these frames."""
+        return self._sources.keys() == yearly_data.keys() and all(
+            self._sources[title] == frame_version(df) for title, df in yearly_data.items()
+        )
+
+    def _expand(self, term):
+        """Vocabulary tokens starting with `term`."""
+        start = bisect_left(self._vocab, term)
+        matches = []
+        for token in self._vocab[start:]:
+            if not token.startswith(term):
+                break
+            matches.append(token)
+        return matches
+
+    def search(self, query, limit=50):
+        """Ranks documents matching every query term (as a word or word prefix) by tf-idf."""
+        terms = tokenize(query)
+        if not terms:
+            return pd.DataFrame(columns=RESULT_COLUMNS + ['score'])
+
+        with self._lock:
+            total_docs = max(len(self), 1)
+            scores = None
+            for term in terms:
+                term_scores = {}
+                for token in self._expand(term):
+                    postings = self._postings[token]
+                    weight = math.log(1 + total_docs / len(postings)) * (1.0 if token == term else PREFIX_WEIGHT)
+                    for doc, tf in postings.items():
+                        term_scores[doc] = max(term_scores.get(doc, 0), tf * weight)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores}
+                if not scores:
+                    break
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))[:limit]
+            docs = [doc for doc, _ in ranked]
+            result = pd.DataFrame({column: [self._docs[column][doc] for doc in docs] for column in RESULT_COLUMNS})
+        result['score'] = [score for _, score in ranked]
+        return result
+
+_index_lock = threading.Lock()
+search_index = SearchIndex()
+
+def get_search_index(yearly_data):
+    """Returns the shared index, rebuilding it only when a yearly frame changed outside our own appends."""
+    global search_index
+    with _index_lock:
+        if not search_index.covers(yearly_data):
+            index = SearchIndex()
+            with span('search_index.build', sheets=len(yearly_data)) as attrs:
+                for title, df in yearly_data.items():
+                    index.add_frame(title, df, frame=df)
+                attrs['rows'] = len(index)
+            search_index = index
+        return search_index
+
+def index_appended_rows(sheet_title, rows, frame):
+    """Adds rows appended through the forms/sync to the live index (no rebuild)."""
+    with _index_lock:
+        if len(search_index):
+            search_index.add_frame(sheet_title, rows, frame=frame)
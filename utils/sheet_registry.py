@@ -0,0 +1,141 @@
+import os
+import re
+import threading
+import time
+
+from utils.instrumentation import span
+from utils.sheets_scheduler import sheets_scheduler
+
+# 🗂️ Worksheet metadata (title → id, grid rows, last write) from one listing call, refreshed only when needed
+REGISTRY_TTL = float(os.environ.get("EXPENSE_TRACKER_REGISTRY_TTL", 600))  # picks up sheets added elsewhere
+SHEET_PREFIX = "test-"
+# Optional monthly partitions: "test-2025-03" holds March 2025 and is read back as part of "test-2025"
+MONTHLY_PARTITIONS = os.environ.get("EXPENSE_TRACKER_MONTHLY_PARTITIONS", "0") == "1"
+_PARTITION_RE = re.compile(r"^(?P<year>.+-\d{4})-(?P<month>\d{2})$")
+
+def year_title(sheet_title):
+    """The yearly sheet a worksheet belongs to ("test-2025-03" → "test-2025")."""
+    match = _PARTITION_RE.match(sheet_title)
+    return match['year'] if match else sheet_title
+
+def partition_title(sheet_title, date):
+    return f"{year_title(sheet_title)}-{date.month:02d}"
+
+def is_partition(sheet_title):
+    return _PARTITION_RE.match(sheet_title) is not None
+
+class WorksheetRegistry:
+    """Worksheet handles and metadata per spreadsheet, from `spreadsheet.worksheets()`.
+
+    Entries hold the worksheet id, its grid size (`row_count`), how many data rows we know it
+    holds (`data_rows`, None until read) and `modified_at`, the time of our last write to it.
+    The listing is fetched again only after `ttl`, on a lookup miss or after `invalidate()`.
+    """
+
+    def __init__(self, ttl=REGISTRY_TTL):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._sheets = {}
+        self._refreshed_at = {}
+        self.refreshes = 0
+
+    def _expired(self, spreadsheet_id):
+        refreshed_at = self._refreshed_at.get(spreadsheet_id)
+        return refreshed_at is None or time.monotonic() - refreshed_at > self.ttl
+
+    def refresh(self, spreadsheet):
+        with span('sheets.list_worksheets'):
+            worksheets = sheets_scheduler.read((spreadsheet.id, 'worksheets'), spreadsheet.worksheets)
+        with self._lock:
+            known = self._sheets.get(spreadsheet.id, {})
+            self._sheets[spreadsheet.id] = {
+                ws.title: {
+                    'id': ws.id,
+                    'worksheet': ws,
+                    'row_count': ws.row_count,
+                    'data_rows': known.get(ws.title, {}).get('data_rows'),
+                    'modified_at': known.get(ws.title, {}).get('modified_at'),
+                }
+                for ws in worksheets
+            }
+            self._refreshed_at[spreadsheet.id] = time.monotonic()
+            self.refreshes += 1
+
+    def _entries(self, spreadsheet):
+        """(entries, whether they were just fetched)."""
+        with self._lock:
+            expired = self._expired(spreadsheet.id)
+        if expired:
+            self.refresh(spreadsheet)
+        with self._lock:
+            return self._sheets.get(spreadsheet.id, {}), expired
+
+    def get(self, spreadsheet, sheet_title):
+        """The entry for a title, re-listing once on a miss (None when the sheet doesn't exist)."""
+        entries, fetched = self._entries(spreadsheet)
+        if sheet_title not in entries and not fetched:
+            self.refresh(spreadsheet)
+            entries, _ = self._entries(spreadsheet)
+        return entries.get(sheet_title)
+
+    def peek(self, spreadsheet_id, sheet_title):
+        """The cached entry without any API call."""
+        with self._lock:
+            return self._sheets.get(spreadsheet_id, {}).get(sheet_title)
+
+    def titles(self, spreadsheet):
+        return list(self._entries(spreadsheet)[0])
+
+    def yearly_titles(self, spreadsheet):
+        """Yearly sheet titles, with monthly partitions folded into their year."""
+        titles = [title for title in self.titles(spreadsheet) if title.lower().startswith(SHEET_PREFIX)]
+        return list(dict.fromkeys(year_title(title) for title in titles))
+
+    def sources(self, spreadsheet, sheet_title):
+        """The worksheets a yearly sheet is read from: itself, then its monthly partitions in order."""
+        titles = self.titles(spreadsheet)
+        partitions = sorted(title for title in titles if is_partition(title) and year_title(title) == sheet_title)
+        return ([sheet_title] if sheet_title in titles else []) + partitions
+
+    def add(self, spreadsheet_id, worksheet, data_rows=0):
+        """Registers a worksheet we just created (no listing call)."""
+        with self._lock:
+            self._sheets.setdefault(spreadsheet_id, {})[worksheet.title] = {
+                'id': worksheet.id,
+                'worksheet': worksheet,
+                'row_count': worksheet.row_count,
+                'data_rows': data_rows,
+                'modified_at': time.time(),
+            }
+
+    def update(self, spreadsheet_id, sheet_title, **fields):
+        with self._lock:
+            entry = self._sheets.get(spreadsheet_id, {}).get(sheet_title)
+            if entry is not None:
+                entry.update(fields)
+
+    def note_append(self, spreadsheet_id, sheet_title, rows):
+        with self._lock:
+            entry = self._sheets.get(spreadsheet_id, {}).get(sheet_title)
+            if entry is not None:
+                if entry['data_rows'] is not None:
+                    entry['data_rows'] += rows
+                entry['modified_at'] = time.time()
+
+    def invalidate(self, spreadsheet_id=None):
+        """Forgets the listing (and the handles, which belong to the old client) of one or every spreadsheet."""
+        with self._lock:
+            ids = [spreadsheet_id] if spreadsheet_id is not None else list(self._sheets)
+            for key in ids:
+                self._sheets.pop(key, None)
+                self._refreshed_at.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'spreadsheets': len(self._sheets),
+                'worksheets': sum(len(sheets) for sheets in self._sheets.values()),
+                'refreshes': self.refreshes,
+            }
+
+sheet_registry = WorksheetRegistry()
@@ -0,0 +1,157 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+import gspread
+import requests
+
+from utils.instrumentation import count, span
+
+# 🚦 Every Sheets request goes through here: per-quota token buckets, retries with jittered
+# backoff (reads on 429/5xx and network errors, writes on 429 only), coalescing of identical
+# in-flight reads and strictly ordered writes.
+READS_PER_MINUTE = float(os.environ.get("EXPENSE_TRACKER_READS_PER_MINUTE", 60))  # per-user read quota
+WRITES_PER_MINUTE = float(os.environ.get("EXPENSE_TRACKER_WRITES_PER_MINUTE", 60))  # per-user write quota
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # seconds, doubled per attempt
+BACKOFF_MAX = 32.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+WRITE_RETRY_STATUSES = {429}  # rejected before it ran; after a 5xx or timeout an append may have landed
+
+class TokenBucket:
+    """`rate_per_minute` requests per minute with bursts of up to `capacity`."""
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1.0, rate_per_minute / 6)  # ~10 s worth of burst
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes one token, sleeping until one is available. Returns the seconds waited."""
+        with self._lock:
+            now = self._clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1  # Reserve now; a negative balance is the queue ahead of us
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+def _status(error):
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+def is_retryable(error, write=False):
+    """Writes aren't idempotent (a retried append can duplicate rows), so they are only retried on 429."""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return not write
+    statuses = WRITE_RETRY_STATUSES if write else RETRY_STATUSES
+    return isinstance(error, gspread.exceptions.APIError) and _status(error) in statuses
+
+def _retry_after(error):
+    response = getattr(error, 'response', None)
+    value = getattr(response, 'headers', {}).get('Retry-After') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+class SheetsScheduler:
+    def __init__(self, reads_per_minute=READS_PER_MINUTE, writes_per_minute=WRITES_PER_MINUTE,
+                 max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX,
+                 clock=time.monotonic, sleep=time.sleep, jitter=random.random):
+        self.buckets = {
+            'read': TokenBucket(reads_per_minute, clock=clock, sleep=sleep),
+            'write': TokenBucket(writes_per_minute, clock=clock, sleep=sleep),
+        }
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        self._in_flight = {}  # read key -> Future
+        self._write_turn = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self.stats_counts = {'reads': 0, 'writes': 0, 'coalesced': 0, 'retries': 0, 'throttled_s': 0.0}
+
+    def backoff(self, attempt, error=None):
+        """Full-jitter exponential backoff, never shorter than a server-sent Retry-After."""
+        delay = self._jitter() * min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        retry_after = _retry_after(error) if error is not None else None
+        return max(delay, retry_after or 0.0)
+
+    def _call(self, quota, fn, args, kwargs):
+        attempt = 0
+        while True:
+            waited = self.buckets[quota].acquire()
+            if waited:
+                with self._lock:
+                    self.stats_counts['throttled_s'] += waited
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e, write=quota == 'write'):
+                    raise
+                delay = self.backoff(attempt, e)
+                attempt += 1
+                with self._lock:
+                    self.stats_counts['retries'] += 1
+                count('sheets_retries')
+                with span('sheets.backoff', attempt=attempt, status=_status(e), delay_s=round(delay, 2)):
+                    self._sleep(delay)
+
+    def read(self, key, fn, *args, **kwargs):
+        """fn(*args) under the read quota; concurrent reads with the same `key` share one request."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.stats_counts['reads'] += 1
+            else:
+                self.stats_counts['coalesced'] += 1
+        if not leader:
+            count('sheets_coalesced_reads')
+            return future.result()
+
+        try:
+            result = self._call('read', fn, args, kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def write(self, fn, *args, **kwargs):
+        """fn(*args) under the write quota, run strictly in the order writes were submitted."""
+        with self._write_turn:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while self._serving != ticket:
+                self._write_turn.wait()
+        try:
+            with self._lock:
+                self.stats_counts['writes'] += 1
+            return self._call('write', fn, args, kwargs)
+        finally:
+            with self._write_turn:
+                self._serving += 1
+                self._write_turn.notify_all()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.stats_counts)
+
+sheets_scheduler = SheetsScheduler()
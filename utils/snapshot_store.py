@@ -0,0 +1,62 @@
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+# 💾 Local columnar (Parquet) snapshots of each yearly worksheet
+SNAPSHOT_DIR = os.environ.get("EXPENSE_TRACKER_SNAPSHOT_DIR", "data/snapshots")
+FULL_SYNC_INTERVAL = 6 * 60 * 60  # seconds before a delta sync becomes a full re-download
+MANIFEST = "manifest.json"  # {sheet title: {"full_synced_at": epoch seconds}}
+_manifest_lock = threading.Lock()
+
+def snapshot_path(sheet_title):
+    return os.path.join(SNAPSHOT_DIR, f"{sheet_title}.parquet")
+
+def save_snapshot(sheet_title, df, columns):
+    """Writes the typed sheet columns atomically (derived columns are rebuilt on load)."""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = snapshot_path(sheet_title)
+    tmp_path = f"{path}.tmp"
+    df.reindex(columns=columns).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def load_snapshot(sheet_title):
+    path = snapshot_path(sheet_title)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return None  # Corrupt or partial snapshot: fall back to the network
+
+def _read_manifest():
+    try:
+        with open(os.path.join(SNAPSHOT_DIR, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def mark_full_sync(sheet_title, synced_at=None):
+    """Records when the sheet was last downloaded in full (delta syncs and appends don't count)."""
+    with _manifest_lock:
+        manifest = _read_manifest()
+        manifest[sheet_title] = {'full_synced_at': time.time() if synced_at is None else synced_at}
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        path = os.path.join(SNAPSHOT_DIR, MANIFEST)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+def full_sync_age(sheet_title):
+    """Seconds since the sheet's last full download, or None when its snapshot has none on record."""
+    entry = _read_manifest().get(sheet_title)
+    if entry is None or not os.path.exists(snapshot_path(sheet_title)):
+        return None
+    return time.time() - entry.get('full_synced_at', 0)
+
+def list_snapshots():
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return []
+    return sorted(name[:-len(".parquet")] for name in os.listdir(SNAPSHOT_DIR) if name.endswith(".parquet"))
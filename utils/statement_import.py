@@ -0,0 +1,213 @@
+from dataclasses import dataclass, field
+from itertools import islice
+import re
+
+import pandas as pd
+
+from utils.categorizer import get_categorizer
+from utils.data_utils import parse_dates, to_minor_units, DATE_FORMAT
+from utils.gsheet_utils import append_rows_to_gsheet, get_or_create_year_sheet, SHEET_COLUMNS
+
+# 📥 Streaming importer for bank/UPI statements (CSV/XLSX) into the yearly "test-" sheets
+IMPORT_CHUNK_ROWS = 5000  # rows parsed per chunk
+IMPORT_BATCH_ROWS = 5000  # rows sent per append call (well under the Sheets request size limit)
+DEDUPE_COLUMNS = ['date', 'credit', 'credit_details', 'debit', 'debit_details']
+
+# Normalized statement header → field (the sheet layout itself maps onto itself)
+COLUMN_ALIASES = {
+    'date': ['date', 'txn date', 'transaction date', 'value date', 'value dt', 'posting date'],
+    'credit': ['credit', 'deposit', 'deposits', 'deposit amt', 'deposit amount', 'credit amount', 'cr'],
+    'debit': ['debit', 'withdrawal', 'withdrawals', 'withdrawal amt', 'withdrawal amount', 'debit amount', 'dr'],
+    'amount': ['amount', 'transaction amount', 'amt'],
+    'details': ['details', 'description', 'narration', 'particulars', 'remarks', 'transaction details'],
+    'credit_details': ['credit details', 'credit_details'],
+    'debit_details': ['debit details', 'debit_details'],
+    'category': ['category', 'expense type'],
+    'side': ['type', 'crdr', 'drcr', 'txn type', 'transaction type'],  # "CR"/"DR" next to an unsigned amount
+}
+
+@dataclass
+class ImportResult:
+    rows_read: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    skipped: int = 0  # no usable date or amount
+    years: dict = field(default_factory=dict)  # sheet title -> rows appended
+
+def _normalize_header(name):
+    name = re.sub(r'\(.*?\)|[^a-z_ ]', '', str(name).lower())
+    return ' '.join(name.split())
+
+def map_columns(columns):
+    """Statement column → field, using the first alias match for each field."""
+    lookup = {alias: target for target, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    mapping = {}
+    for column in columns:
+        target = lookup.get(_normalize_header(column))
+        if target is not None and target not in mapping.values():
+            mapping[column] = target
+    return mapping
+
+# 📄 Chunked readers (only one chunk of raw rows is held in memory)
+def _csv_chunks(source, chunk_rows):
+    yield from pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False, encoding_errors='replace')
+
+def _xlsx_chunks(source, chunk_rows):
+    import openpyxl  # Only needed for spreadsheet statements
+
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            rows = worksheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                continue
+            columns = ['' if value is None else str(value).strip() for value in header]
+            width = len(columns)
+            while True:
+                batch = [row[:width] for row in islice(rows, chunk_rows)]
+                if not batch:
+                    break
+                yield pd.DataFrame(batch, columns=columns)
+    finally:
+        workbook.close()
+
+def iter_statement_chunks(source, file_name, chunk_rows=IMPORT_CHUNK_ROWS):
+    if file_name.lower().endswith(('.xlsx', '.xlsm')):
+        return _xlsx_chunks(source, chunk_rows)
+    return _csv_chunks(source, chunk_rows)
+
+# 🧹 Raw statement chunk → typed rows in the sheet layout
+def _parse_amount(series):
+    cleaned = series.astype(str).str.replace(r'[^0-9.\-]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').fillna(0).round(2)
+
+def _clean_text(series):
+    text = series.astype(str).str.strip()
+    return text.mask(series.isna() | text.isin(['', 'nan', 'None', 'NA']), '')
+
+def normalize_chunk(chunk, mapping):
+    """Typed rows (datetime dates, signed amounts, 'NA' for missing details) plus the count of dropped rows."""
+    fields = chunk.rename(columns=mapping)
+    if 'date' not in fields:
+        raise ValueError("No date column found in the statement.")
+
+    dates = parse_dates(fields['date'].where(fields['date'].astype(str).str.strip() != ''))
+    if 'credit' in fields or 'debit' in fields:
+        credit = _parse_amount(fields['credit']).abs() if 'credit' in fields else pd.Series(0.0, index=fields.index)
+        debit = -_parse_amount(fields['debit']).abs() if 'debit' in fields else pd.Series(0.0, index=fields.index)
+    elif 'amount' in fields:
+        amount = _parse_amount(fields['amount'])
+        if 'side' in fields:
+            side = fields['side'].astype(str).str.strip().str.lower()
+            amount = amount.mask(side.str.startswith('c'), amount.abs()).mask(side.str.startswith('d'), -amount.abs())
+        credit, debit = amount.clip(lower=0), amount.clip(upper=0)
+    else:
+        raise ValueError("No amount, credit or debit column found in the statement.")
+
+    details = _clean_text(fields['details']) if 'details' in fields else pd.Series('', index=fields.index)
+    credit_details = _clean_text(fields['credit_details']) if 'credit_details' in fields else details
+    debit_details = _clean_text(fields['debit_details']) if 'debit_details' in fields else details
+    category = _clean_text(fields['category']) if 'category' in fields else pd.Series('', index=fields.index)
+
+    valid = (dates.notna() & ((credit != 0) | (debit != 0))).to_numpy()
+    rows = pd.DataFrame({
+        'date': dates,
+        'credit': credit,
+        'credit_details': credit_details.where(credit != 0, ''),
+        'debit': debit,
+        'debit_details': debit_details.where(debit != 0, ''),
+        'category': category,  # '' is filled in by the categorizer
+    })[valid].reset_index(drop=True)
+    return rows, int((~valid).sum())
+
+# #️⃣ Duplicate detection by row hash (amounts in paise, details trimmed, 'NA' treated as empty)
+def row_hashes(rows):
+    key = pd.DataFrame({
+        'date': parse_dates(rows['date']).dt.strftime(DATE_FORMAT),
+        'credit': to_minor_units(rows['credit']),
+        'credit_details': _clean_text(rows['credit_details']),
+        'debit': to_minor_units(rows['debit']),
+        'debit_details': _clean_text(rows['debit_details']),
+    }, index=rows.index)
+    return pd.util.hash_pandas_object(key[DEDUPE_COLUMNS], index=False)
+
+class RowDeduper:
+    """Keeps a row only when its hash occurs more often in the import than in the sheets
+    (so genuinely repeated transactions, e.g. two identical payments on one day, survive)."""
+
+    def __init__(self, existing_frames):
+        hashes = [row_hashes(df) for df in existing_frames if df is not None and not df.empty]
+        self._existing = pd.concat(hashes).value_counts() if hashes else pd.Series(dtype='int64')
+        self._seen = pd.Series(dtype='int64')
+
+    def new_rows(self, rows):
+        hashes = row_hashes(rows)
+        occurrence = hashes.groupby(hashes).cumcount() + hashes.map(self._seen).fillna(0).astype('int64')
+        keep = occurrence >= hashes.map(self._existing).fillna(0).astype('int64')
+        self._seen = self._seen.add(hashes.value_counts(), fill_value=0).astype('int64')
+        return keep.to_numpy()
+
+def _whole_numbers(series):
+    """Amounts as Python ints when whole (the sheet stores plain integers), floats otherwise."""
+    values = series.astype(object)
+    whole = (series == series.round()).to_numpy()
+    values[whole] = series[whole].astype('int64').tolist()
+    return values
+
+def _to_sheet_rows(rows):
+    out = rows.copy()
+    out['month'] = out['date'].dt.strftime('%B')
+    out['date'] = out['date'].dt.strftime(DATE_FORMAT)
+    out['credit'] = _whole_numbers(out['credit'])
+    out['debit'] = _whole_numbers(out['debit'])
+    out['credit_details'] = out['credit_details'].mask(out['credit_details'] == '', 'NA')
+    out['debit_details'] = out['debit_details'].mask(out['debit_details'] == '', 'NA')
+    return out[SHEET_COLUMNS].to_dict('records')
+
+# 🚀 Stream a statement into the yearly sheets (batched appends, one worksheet per year)
+def import_statement(spreadsheet, source, file_name, yearly_data, dry_run=False,
+                     chunk_rows=IMPORT_CHUNK_ROWS, batch_rows=IMPORT_BATCH_ROWS, on_progress=None):
+    result = ImportResult()
+    deduper = RowDeduper(yearly_data.values())
+    categorizer = get_categorizer(yearly_data)
+    buffers = {}
+
+    def flush(sheet_title):
+        rows = buffers.pop(sheet_title, [])
+        if rows and not dry_run:
+            append_rows_to_gsheet(get_or_create_year_sheet(spreadsheet, sheet_title), rows)
+        result.imported += len(rows)
+        result.years[sheet_title] = result.years.get(sheet_title, 0) + len(rows)
+
+    mapping = None
+    for chunk in iter_statement_chunks(source, file_name, chunk_rows):
+        if mapping is None:
+            mapping = map_columns(chunk.columns)
+        rows, skipped = normalize_chunk(chunk, mapping)
+        result.rows_read += len(chunk)
+        result.skipped += skipped
+
+        keep = deduper.new_rows(rows)
+        result.duplicates += int((~keep).sum())
+        rows = rows[keep]
+
+        uncategorized = (rows['category'] == '').to_numpy()
+        if uncategorized.any():
+            is_credit = (rows['credit'] > 0).to_numpy()[uncategorized]
+            details = rows['credit_details'].where(rows['credit'] > 0, rows['debit_details'])[uncategorized]
+            rows.loc[uncategorized, 'category'] = categorizer.categorize(details, is_credit)
+
+        titles = 'test-' + rows['date'].dt.year.astype(str)
+        for sheet_title, year_rows in rows.groupby(titles.to_numpy(), sort=True):
+            buffer = buffers.setdefault(sheet_title, [])
+            buffer.extend(_to_sheet_rows(year_rows))
+            if len(buffer) >= batch_rows:
+                flush(sheet_title)
+
+        if on_progress is not None:
+            on_progress(result)
+
+    for sheet_title in sorted(buffers):
+        flush(sheet_title)
+    return result
@@ -1,14 +1,83 @@
+import calendar
+import math
 import streamlit as st
 import pandas as pd
-from utils.data_utils import get_current_date_month, build_summary_df
-from utils.gsheet_utils import update_data_to_gsheet
-from utils.yearly_overview import plot_category_chart, apply_custom_style_row
-
-# 🔁 Unified form logic
-def _append_and_update(df, sheet, new_row, success_msg):
-    df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-    update_data_to_gsheet(sheet, df)
-    st.toast(success_msg, icon="✅")
+from utils.data_utils import DATE_FORMAT, get_current_date_month, build_summary_df
+from utils.gsheet_utils import append_rows_to_gsheet, append_canonical_rows, prefetch_status, prefetched_yearly_data
+from utils.categorizer import get_categorizer
+from utils.instrumentation import traced
+
+PENDING_ROWS_KEY = 'pending_rows'
+MONTHS_PER_PAGE = 3
+AUTO_CATEGORY = "🤖 Auto-detect"
+
+# 🔁 Unified form logic (append-only: new rows are queued and sent in one call)
+def _queue_row(new_row):
+    st.session_state.setdefault(PENDING_ROWS_KEY, []).append(new_row)
+
+def flush_pending_rows(df, sheet):
+    """Appends every queued row to the sheet in one call and returns the synced DataFrame."""
+    pending = st.session_state.get(PENDING_ROWS_KEY, [])
+    if not pending:
+        return df
+    if sheet is None:
+        st.warning(f"Offline: {len(pending)} queued entries will be saved once Google Sheets is reachable.")
+        return df
+    try:
+        append_rows_to_gsheet(sheet, pending)
+    except Exception as e:
+        st.error(f"Could not save {len(pending)} queued entries: {e}")
+        return df
+    st.session_state[PENDING_ROWS_KEY] = []
+    return append_canonical_rows(df, sheet.title, pending)
+
+def _append_and_update(df, sheet, new_row, success_msg, queue_only=False):
+    _queue_row(new_row)
+    if queue_only:
+        st.toast("Entry queued. Save the queue to upload it.", icon="🕒")
+        return df
+    count = len(st.session_state[PENDING_ROWS_KEY])
+    df = flush_pending_rows(df, sheet)
+    if not st.session_state[PENDING_ROWS_KEY]:
+        st.toast(success_msg if count == 1 else f"{count} entries added successfully!", icon="✅")
+    return df
+
+# 🤖 Resolve "Auto-detect" from the details text (all prefetched years, else this year's rows)
+def _resolve_category(category, details, is_credit, options, fallback, df, sheet):
+    if category != AUTO_CATEGORY:
+        return category
+    if not details:
+        return fallback  # Nothing to classify: the form's usual default
+    history = prefetched_yearly_data() or ({sheet.title: df} if sheet is not None else {})
+    category = get_categorizer(history).suggest(details, is_credit, options) or fallback
+    st.toast(f"Category detected: {category.strip()}", icon="🤖")
+    return category
+
+# 🚚 Background yearly-data prefetch (read-only status, never waits on the loader)
+def show_prefetch_status():
+    status = dict(prefetch_status)
+    if status['state'] == 'running':
+        progress = f" ({status['loaded']}/{status['total']} years)" if status['total'] else ""
+        st.caption(f"⏳ Loading yearly data in the background{progress}…")
+    elif status['state'] == 'failed':
+        st.caption(f"⚠️ Background loading of yearly data failed, analytics tabs will load on open: {status['error']}")
+
+# 🕒 Queued entries waiting to be uploaded together
+def show_pending_queue(df, sheet):
+    pending = st.session_state.get(PENDING_ROWS_KEY, [])
+    if not pending:
+        return df
+    st.markdown(f"**🕒 Queued entries ({len(pending)})**")
+    st.dataframe(pd.DataFrame(pending), use_container_width=True, hide_index=True)
+    col1, col2 = st.columns(2)
+    if col1.button(f"Save {len(pending)} queued entries", key="save_pending_rows"):
+        count = len(pending)
+        df = flush_pending_rows(df, sheet)
+        if not st.session_state[PENDING_ROWS_KEY]:
+            st.toast(f"{count} entries added successfully!", icon="✅")
+    if col2.button("Discard queue", key="discard_pending_rows"):
+        st.session_state[PENDING_ROWS_KEY] = []
+    return df
 
 # ➕ Credit Entry Form
 def show_credit_form(df, sheet):
@@ -16,9 +85,11 @@ def show_credit_form(df, sheet):
 
     with st.form("credit_form", clear_on_submit=True):
         amount = st.number_input("Enter credited amount:", min_value=0, key="credit_amount")
-        category = st.selectbox("Income Type:", category_options)
+        category = st.selectbox("Income Type:", [AUTO_CATEGORY] + category_options)
         source = st.text_input("Source description:")
+        queue_only = st.checkbox("Add to queue (save later in one batch)", key="credit_queue_only")
         if st.form_submit_button("Add Credit Details") and amount > 0:
+            category = _resolve_category(category, source, True, category_options, "Salary", df, sheet)
             date, month = get_current_date_month()
             new_row = {
                 'date': date,
@@ -29,8 +100,9 @@ def show_credit_form(df, sheet):
                 'debit_details': 'NA',
                 'category': category
             }
-            _append_and_update(df, sheet, new_row, "Credit details added successfully!")
-            
+            df = _append_and_update(df, sheet, new_row, "Credit details added successfully!", queue_only)
+
+    return show_pending_queue(df, sheet)
 
 # ➖ Debit Entry Form
 def show_debit_form(df, sheet):
@@ -43,9 +115,11 @@ def show_debit_form(df, sheet):
 
     with st.form("debit_form", clear_on_submit=True):
         amount = st.number_input("Enter debited amount:", min_value=0, key="debit_amount")
-        category = st.selectbox("Expense Type:", category_options)
+        category = st.selectbox("Expense Type:", [AUTO_CATEGORY] + category_options)
         note = st.text_input("Details/Source:")
+        queue_only = st.checkbox("Add to queue (save later in one batch)", key="debit_queue_only")
         if st.form_submit_button("Add Debit Details") and amount > 0:
+            category = _resolve_category(category, note, False, category_options, "Today's expense ", df, sheet)
             date, month = get_current_date_month()
             new_row = {
                 'date': date,
@@ -56,11 +130,16 @@ def show_debit_form(df, sheet):
                 'debit_details': note or 'NA',
                 'category': category
             }
-            _append_and_update(df, sheet, new_row, "Debit details added successfully!")
-            
+            df = _append_and_update(df, sheet, new_row, "Debit details added successfully!", queue_only)
+
+    return show_pending_queue(df, sheet)
 
 # 📊 Monthly Summary + Visuals
+@traced()
 def show_summary(yearly_data):
+    # Deferred: matplotlib is only loaded once this page is opened
+    from utils.yearly_overview import plot_category_chart, apply_custom_style_row
+
     # Extract available years from the keys
     years = []
     for key in yearly_data.keys():
@@ -85,30 +164,38 @@ def show_summary(yearly_data):
     df = build_summary_df(df)  # Now passing the correct DataFrame
 
     df['month'] = pd.to_datetime(df['month'], format='%B', errors='coerce')
-    df = df.dropna(subset=['month']).sort_values('month', ascending=False)
-
-    final_saving = 0
-    total_by_category = {}
-
-    for month in df['month'].dt.strftime('%B').unique():
-        st.subheader(f"📅 {month}")
-        month_df = df[df['month'].dt.strftime('%B') == month]
-
-        credit = month_df.query("amount > 0")['amount'].sum()
-        debit = abs(month_df.query("amount < 0")['amount'].sum())
-        savings = credit - debit
-        final_saving += savings
+    df = df.dropna(subset=['month'])
+    df['month_num'] = df['month'].dt.month
+
+    # 🧮 One grouped pass for every month total and month × category total
+    signed = df.assign(credit=df['amount'].clip(lower=0), debit=df['amount'].clip(upper=0).abs())
+    monthly = signed.groupby('month_num')[['credit', 'debit']].sum().sort_index(ascending=False)
+    monthly['savings'] = monthly['credit'] - monthly['debit']
+    month_category = df.groupby(['month_num', 'category'], observed=True)['amount'].sum().abs()
+    total_by_category = month_category.groupby(level='category', observed=True).sum()
+    final_saving = monthly['savings'].sum()
+    month_rows = df.groupby('month_num').indices
+
+    # 📄 Only the months on the current page are rendered (tables + charts)
+    months = monthly.index.tolist()
+    page_count = max(1, math.ceil(len(months) / MONTHS_PER_PAGE))
+    page = 1
+    if page_count > 1:
+        page = st.number_input(f"Page (of {page_count}, newest months first):", min_value=1, max_value=page_count, value=1)
+    page_months = months[(page - 1) * MONTHS_PER_PAGE: page * MONTHS_PER_PAGE]
+
+    for month_num in page_months:
+        credit, debit, savings = monthly.loc[month_num, ['credit', 'debit', 'savings']]
+        month_df = df.iloc[month_rows[month_num]]
+        st.subheader(f"📅 {calendar.month_name[month_num]}")
 
         st.markdown(f"**Total Credited:** <span style='color:green; font-size:22px'>₹{credit}</span>", unsafe_allow_html=True)
         st.markdown(f"**Total Debited:** <span style='color:red; font-size:22px'>₹{debit}</span>", unsafe_allow_html=True)
         color = 'green' if savings >= 0 else 'red'
         st.markdown(f"**Savings:** <span style='color:{color}; font-size:22px'>₹{savings}</span>", unsafe_allow_html=True)
 
-        for cat in month_df['category'].dropna().unique():
-            amt = abs(month_df[month_df['category'] == cat]['amount'].sum())
-            total_by_category[cat] = total_by_category.get(cat, 0) + amt
-
         display_df = month_df[['date', 'amount', 'details', 'category']].sort_values('date')
+        display_df['date'] = display_df['date'].dt.strftime(DATE_FORMAT)
         st.dataframe(display_df.style.apply(apply_custom_style_row, axis=1), use_container_width=True)
         plot_category_chart(month_df, debit)
 
@@ -117,7 +204,7 @@ def show_summary(yearly_data):
     st.markdown(f"<h1 style='text-align:center;color:{color};'>₹{final_saving}</h1>", unsafe_allow_html=True)
 
     st.markdown("<h3 style='text-align:center;'>Expenses by Category:</h3>", unsafe_allow_html=True)
-    exp_df = pd.DataFrame(total_by_category.items(), columns=['Category', 'Amount'])
+    exp_df = pd.DataFrame({'Category': total_by_category.index.astype(str), 'Amount': total_by_category.to_numpy()})
     exclude_categories = ['salary', 'udemy income', 'side income', 'youtube earning']
     exp_df = exp_df[~exp_df['Category'].str.lower().isin(exclude_categories)]
     st.table(exp_df.sort_values('Amount', ascending=False))
@@ -2,45 +2,72 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 from datetime import datetime
+from utils.data_utils import summarize_periods
+from utils.chart_cache import cached_chart
+from utils.instrumentation import traced
 
-def generate_weekly_insights(df):
+# 📊 Chart builders (cached by input data)
+def _weekly_summary_chart(melted):
+    return alt.Chart(melted).mark_bar(size=20).encode(
+        y=alt.Y('week_label:N', title='Week', sort='ascending'),
+        x=alt.X('Amount:Q', title='Amount (₹)'),
+        color=alt.Color('Type:N', title='Type', scale=alt.Scale(scheme='category10')),
+        tooltip=['week_label', 'Type', alt.Tooltip('Amount:Q', format='.0f')]
+    ).properties(height=220)
+
+def _avg_spend_chart(avg_spend):
+    return alt.Chart(avg_spend).mark_line(point=True).encode(
+        x=alt.X('week_label:N', title='Week'),
+        y=alt.Y('avg_daily_spend:Q', title='Avg Daily Spend (₹)'),
+        tooltip=[alt.Tooltip('week_label:N', title='Week'),
+                 alt.Tooltip('avg_daily_spend:Q', title='₹', format='.0f')]
+    )
+
+def _most_spent_chart(display_df):
+    return alt.Chart(display_df).mark_bar().encode(
+        y=alt.Y('Week:N'),
+        x=alt.X('Total Spent (₹):Q'),
+        color=alt.Color('Top Category:N'),
+        tooltip=[
+            alt.Tooltip('Week:N'),
+            alt.Tooltip('Most Spent Day:T', title='Date', format='%d %b %Y'),
+            alt.Tooltip('Total Spent (₹):Q', format='.0f'),
+            alt.Tooltip('Top Category:N')
+        ]
+    )
+
+@traced()
+def generate_weekly_insights(df, aggregates=None):
     st.subheader("📆 Weekly Credit vs Debit")
 
-    # Exclude SIP and convert date
-    df = df[df['category'].str.lower() != 'sip'].copy()
-    df['date'] = pd.to_datetime(df['date'], dayfirst=True)
+    # Exclude SIP (dates and ISO weeks are already typed by the loader)
+    df = df[df['category_lower'] != 'sip'].copy()
 
     # Filter current month
     today = datetime.today()
     df = df[(df['date'].dt.month == today.month) & (df['date'].dt.year == today.year)]
 
     # Week and year info
-    df['week'] = df['date'].dt.isocalendar().week
-    df['year'] = df['date'].dt.year
+    df['year'] = df['iso_year']
 
     # Helper function for week label
     def get_week_label(week):
         return f"Week {int(week)}"
 
-    # ---- Weekly Summary Chart ----
-    weekly_summary = df.groupby(['year', 'week']).agg({
-        'debit': lambda x: x[x < 0].sum(),
-        'credit': lambda x: x[x > 0].sum()
-    }).reset_index()
-    weekly_summary['debit'] = weekly_summary['debit'].abs()
-    weekly_summary['savings'] = weekly_summary['credit'] - weekly_summary['debit']
+    # ---- Weekly Summary Chart (from the shared aggregate store when available) ----
+    source = df
+    if aggregates is not None:
+        buckets = aggregates.frame()
+        source = buckets[
+            (buckets['year'] == today.year) & (buckets['month'] == today.month) & (buckets['category_lower'] != 'sip')
+        ].drop(columns='year').rename(columns={'iso_year': 'year'})
+    weekly_summary = summarize_periods(source, ['year', 'week'])
     weekly_summary['week_label'] = weekly_summary['week'].apply(get_week_label)
 
     melted = weekly_summary.melt(id_vars='week_label', value_vars=['debit', 'credit'],
                                   var_name='Type', value_name='Amount')
 
-    bar_chart = alt.Chart(melted).mark_bar(size=20).encode(
-        y=alt.Y('week_label:N', title='Week', sort='ascending'),
-        x=alt.X('Amount:Q', title='Amount (₹)'),
-        color=alt.Color('Type:N', title='Type', scale=alt.Scale(scheme='category10')),
-        tooltip=['week_label', 'Type', alt.Tooltip('Amount:Q', format='.0f')]
-    ).properties(height=220)
-    st.altair_chart(bar_chart, use_container_width=True)
+    st.altair_chart(cached_chart('weekly_summary', _weekly_summary_chart, melted), use_container_width=True)
     st.dataframe(
         weekly_summary[['week_label', 'credit', 'debit', 'savings']].rename(columns={
             'week_label': 'Week', 'credit': 'Credit (₹)', 'debit': 'Debit (₹)', 'savings': 'Savings (₹)'
@@ -60,14 +87,7 @@ def generate_weekly_insights(df):
     avg_spend['avg_daily_spend'] = avg_spend['debit'] / 7
     avg_spend['week_label'] = avg_spend['week'].apply(get_week_label)
 
-    line_chart = alt.Chart(avg_spend).mark_line(point=True).encode(
-        x=alt.X('week_label:N', title='Week'),
-        y=alt.Y('avg_daily_spend:Q', title='Avg Daily Spend (₹)'),
-        tooltip=[alt.Tooltip('week_label:N', title='Week'),
-                 alt.Tooltip('avg_daily_spend:Q', title='₹', format='.0f')]
-    )
-
-    st.altair_chart(line_chart, use_container_width=True)
+    st.altair_chart(cached_chart('weekly_avg_spend', _avg_spend_chart, avg_spend), use_container_width=True)
     st.dataframe(
         avg_spend[['week_label', 'avg_daily_spend']].rename(columns={
             'week_label': 'Week', 'avg_daily_spend': 'Avg Daily Spend (₹)'
@@ -84,7 +104,7 @@ def generate_weekly_insights(df):
     most_spent = daily_total.sort_values(['year', 'week', 'debit'], ascending=[True, True, False])
     most_spent = most_spent.groupby(['year', 'week']).first().reset_index()
 
-    top_cat = debit_df.groupby(['year', 'week', 'date_only', 'category'])['debit'].sum().reset_index()
+    top_cat = debit_df.groupby(['year', 'week', 'date_only', 'category'], observed=True)['debit'].sum().reset_index()
     top_cat = top_cat.sort_values(['year', 'week', 'date_only', 'debit'], ascending=[True, True, True, False])
     top_cat = top_cat.groupby(['year', 'week', 'date_only']).first().reset_index()
 
@@ -95,19 +115,7 @@ def generate_weekly_insights(df):
         'week_label': 'Week', 'date_only': 'Most Spent Day', 'debit_x': 'Total Spent (₹)', 'category': 'Top Category'
     })
 
-    bar_chart = alt.Chart(display_df).mark_bar().encode(
-        y=alt.Y('Week:N'),
-        x=alt.X('Total Spent (₹):Q'),
-        color=alt.Color('Top Category:N'),
-        tooltip=[
-            alt.Tooltip('Week:N'),
-            alt.Tooltip('Most Spent Day:T', title='Date', format='%d %b %Y'),
-            alt.Tooltip('Total Spent (₹):Q', format='.0f'),
-            alt.Tooltip('Top Category:N')
-        ]
-    )
-
-    st.altair_chart(bar_chart, use_container_width=True)
+    st.altair_chart(cached_chart('weekly_most_spent', _most_spent_chart, display_df), use_container_width=True)
 
     st.dataframe(
         display_df.style.format({
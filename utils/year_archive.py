@@ -0,0 +1,92 @@
+from datetime import datetime
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+
+# 🧊 Closed years frozen on disk: typed rows + pre-aggregated buckets + checksums (never re-downloaded)
+ARCHIVE_DIR = os.environ.get("EXPENSE_TRACKER_ARCHIVE_DIR", "data/archives")
+YEAR_CLOSE_GRACE_DAYS = 15  # late edits to last year's sheet are still picked up until then
+COMPRESSION = "zstd"
+ARCHIVE_FILES = ['rows', 'buckets', 'daily']  # rows; (year, month, week, category) and (day, category) totals
+MANIFEST = "manifest.json"
+
+def archive_path(sheet_title):
+    return os.path.join(ARCHIVE_DIR, sheet_title)
+
+def is_closed(sheet_title, today=None):
+    """True once the sheet's year is over (plus the grace period)."""
+    year = sheet_title.split('-')[-1]
+    if not year.isdigit():
+        return False
+    today = today or datetime.now()
+    return (today - datetime(int(year) + 1, 1, 1)).days >= YEAR_CLOSE_GRACE_DAYS
+
+def _checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def save_archive(sheet_title, rows, buckets, daily):
+    """Writes the archive into a temporary directory and swaps it in, so readers never see half of it."""
+    target = archive_path(sheet_title)
+    tmp_dir = f"{target}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    checksums = {}
+    for name, frame in zip(ARCHIVE_FILES, (rows, buckets, daily)):
+        path = os.path.join(tmp_dir, f"{name}.parquet")
+        frame.to_parquet(path, index=False, compression=COMPRESSION)
+        checksums[name] = _checksum(path)
+    manifest = {
+        'sheet': sheet_title,
+        'rows': len(rows),
+        'closed_at': datetime.now().isoformat(timespec='seconds'),
+        'sha256': checksums,
+    }
+    with open(os.path.join(tmp_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp_dir, target)
+    return manifest
+
+def load_archive(sheet_title):
+    """{'rows', 'buckets', 'daily', 'manifest'}, or None when missing or damaged.
+
+    An archive failing any checksum is deleted: the year is read from Google Sheets again and
+    frozen anew, instead of staying listed and being re-hashed on every load.
+    """
+    directory = archive_path(sheet_title)
+    if not os.path.exists(os.path.join(directory, MANIFEST)):
+        return None
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        archive = {'manifest': manifest}
+        for name in ARCHIVE_FILES:
+            path = os.path.join(directory, f"{name}.parquet")
+            if _checksum(path) != manifest['sha256'][name]:
+                raise ValueError(f"Checksum mismatch: {path}")
+            archive[name] = pd.read_parquet(path)
+    except (OSError, ValueError, KeyError):
+        remove_archive(sheet_title)
+        return None
+    return archive
+
+def list_archives():
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    return sorted(
+        name for name in os.listdir(ARCHIVE_DIR)
+        if os.path.exists(os.path.join(ARCHIVE_DIR, name, MANIFEST))
+    )
+
+def remove_archive(sheet_title):
+    """Reopens a closed year: it is read from Google Sheets again on the next load."""
+    shutil.rmtree(archive_path(sheet_title), ignore_errors=True)
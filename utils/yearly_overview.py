@@ -1,50 +1,66 @@
+from io import BytesIO
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import streamlit as st
 import altair as alt
+from utils.aggregates import get_aggregates
+from utils.chart_cache import cached_chart
+from utils.instrumentation import traced
 
 def plot_category_chart(df, total_debit):
+    # Rendered once per distinct (category, amount) data; the figure itself is closed right after rendering
+    png = cached_chart('category_chart', _render_category_chart, df[['category', 'amount']], total_debit)
+    st.image(png)
+
+def _render_category_chart(df, total_debit):
     exclude_categories = ['credit', 'sip', 'salary', 'udemy income', 'side income', 'youtube earning']
     chart_data = (
         df.copy()
         .assign(amount=lambda d: d['amount'].abs())
         .loc[~df['category'].str.lower().isin(exclude_categories)]
-        .groupby('category', as_index=False)['amount'].sum()
+        .groupby('category', as_index=False, observed=True)['amount'].sum()
         .sort_values('amount')
     )
     chart_data['percentage'] = (chart_data['amount'] / chart_data['amount'].sum()) * 100
 
     fig, ax = plt.subplots()
-    bars = ax.barh(chart_data['category'], chart_data['amount'], color=plt.cm.Paired(np.arange(len(chart_data))))
-
-    for bar, val, perc in zip(bars, chart_data['amount'], chart_data['percentage']):
-        x_pos = bar.get_width() + 1 if val < 0.25 * total_debit else bar.get_width() - 5
-        color = 'white' if val >= 0.25 * total_debit else 'black'
-        ha = 'left' if val < 0.25 * total_debit else 'right'
-        ax.text(x_pos, bar.get_y() + bar.get_height() / 2, f'{val:.0f} ({perc:.1f}%)', va='center', ha=ha, color=color)
-
-    ax.set_title('Total Debit by Category')
-    st.pyplot(fig)
+    try:
+        bars = ax.barh(chart_data['category'], chart_data['amount'], color=plt.cm.Paired(np.arange(len(chart_data))))
+
+        for bar, val, perc in zip(bars, chart_data['amount'], chart_data['percentage']):
+            x_pos = bar.get_width() + 1 if val < 0.25 * total_debit else bar.get_width() - 5
+            color = 'white' if val >= 0.25 * total_debit else 'black'
+            ha = 'left' if val < 0.25 * total_debit else 'right'
+            ax.text(x_pos, bar.get_y() + bar.get_height() / 2, f'{val:.0f} ({perc:.1f}%)', va='center', ha=ha, color=color)
+
+        ax.set_title('Total Debit by Category')
+        buffer = BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
 
 def apply_custom_style_row(row):
     return [f"color: {'green' if row['amount'] >= 0 else 'red'}"] * len(row)
 
 def show_savings_line_chart(summary_df):
     st.subheader("📈 Yearly Savings (Line Chart)")
+    st.altair_chart(cached_chart('yearly_savings', _build_savings_line_chart, summary_df), use_container_width=True)
 
-    chart = alt.Chart(summary_df).mark_line(point=True).encode(
+def _build_savings_line_chart(summary_df):
+    return alt.Chart(summary_df).mark_line(point=True).encode(
         y=alt.Y("Year:O", sort="ascending", title="Year"),
         x=alt.X("Savings:Q", title="Savings (₹)"),
         tooltip=["Year", "Savings"],
         color=alt.condition("datum.Savings >= 0", alt.value("green"), alt.value("red"))
     ).properties(height=300)
 
-    st.altair_chart(chart, use_container_width=True)
-
 def show_credit_vs_debit(summary_df):
     st.subheader("📊 Credit vs Spend")
+    st.altair_chart(cached_chart('credit_vs_spend', _build_credit_vs_debit, summary_df), use_container_width=True)
 
+def _build_credit_vs_debit(summary_df):
     melted_df = summary_df.melt(
         id_vars="Year", value_vars=["Credit", "Spend"],
         var_name="Type", value_name="Amount"
@@ -74,13 +90,14 @@ def show_credit_vs_debit(summary_df):
         text=alt.Text("Label:N")
     )
 
-    st.altair_chart(bar + text, use_container_width=True)
+    return bar + text
 
 def show_all_category_data(yearly_data_dict):
-    all_data = pd.concat(yearly_data_dict.values(), ignore_index=True)
-    all_data['category'] = all_data['category'].astype(str).str.lower()
+    # Category buckets from the shared aggregate store instead of concatenating every year
+    buckets = get_aggregates(yearly_data_dict).frame(yearly_data_dict.keys())
+    buckets = buckets.assign(category=buckets['category_lower'])
 
-    spend_data = all_data.query("category != 'credit' and category != 'other'").copy()
+    spend_data = buckets.query("category != 'credit' and category != 'other'").copy()
     spend_data['amount'] = spend_data['debit'].abs()
     total_debit = spend_data['amount'].sum()
 
@@ -114,22 +131,22 @@ def show_yearly_credit_spends(summary_df):
     )
     st.markdown("---")
 
+@traced()
 def show_yearly_overview(yearly_data_dict):
     if not yearly_data_dict:
         st.info("No yearly data available.")
         return
 
-    summary = [
-        {
-            "Year": int(sheet.split('-')[-1]),
-            "Credit": df['credit'].sum(),
-            "Spend": abs(df['debit'].sum()),
-            "Savings": df['credit'].sum() - abs(df['debit'].sum())
-        }
-        for sheet, df in yearly_data_dict.items()
-    ]
-
-    summary_df = pd.DataFrame(summary).sort_values(by="Year")
+    buckets = get_aggregates(yearly_data_dict).frame(yearly_data_dict.keys())
+    totals = buckets.groupby('sheet', as_index=False)[['credit', 'debit']].sum()
+
+    summary_df = pd.DataFrame({
+        "Year": totals['sheet'].str.split('-').str[-1].astype(int),
+        "Credit": totals['credit'],
+        "Spend": totals['debit'].abs(),
+    })
+    summary_df["Savings"] = summary_df["Credit"] - summary_df["Spend"]
+    summary_df = summary_df.sort_values(by="Year")
 
     show_credit_vs_debit(summary_df)
     show_savings_line_chart(summary_df)